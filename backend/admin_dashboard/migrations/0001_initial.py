@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:01
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    AnalyticsRollup = apps.get_model('admin_dashboard', 'AnalyticsRollup')
+    tasks = Task.objects.order_by()
+    rows = []
+    for metric, field in (
+        ('tasks_by_status', 'status'),
+        ('tasks_by_group', 'group_id'),
+        ('tasks_per_manager', 'created_by_id'),
+    ):
+        for value, count in tasks.values(field).annotate(n=Count('id')).values_list(field, 'n'):
+            rows.append(AnalyticsRollup(metric=metric, key='' if value is None else str(value), count=count))
+    days = tasks.filter(completed_at__isnull=False).annotate(
+        day=TruncDate('completed_at')
+    ).values('day').annotate(n=Count('id')).values_list('day', 'n')
+    for day, count in days:
+        rows.append(AnalyticsRollup(metric='completions_by_day', key=day.isoformat(), count=count))
+    AnalyticsRollup.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('tasks', '0010_task_completed_at_status_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=50)),
+                ('key', models.CharField(blank=True, max_length=100)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('metric', 'key'), name='unique_analytics_rollup')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,22 @@
 from django.db import models
 
-# Create your models here.
+
+class AnalyticsRollup(models.Model):
+    """
+    Precomputed task count for one bucket of an analytics metric, e.g.
+    ('tasks_by_status', 'todo') or ('completions_by_day', '2024-05-01').
+    Kept current by admin_dashboard.rollups from task changes and rebuilt
+    from scratch by the rebuild_analytics_rollups command.
+    """
+    metric = models.CharField(max_length=50)
+    # Bucket value as text; '' stands for "none" (no group, no creator)
+    key = models.CharField(max_length=100, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'key'], name='unique_analytics_rollup'),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}[{self.key}] = {self.count}"
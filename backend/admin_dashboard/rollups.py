@@ -0,0 +1,120 @@
+from collections import Counter
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from tasks.models import Task
+from .models import AnalyticsRollup
+
+
+def bucket_key(value):
+    return '' if value is None else str(value)
+
+
+def task_buckets(values):
+    """(metric, key) buckets counted for a task with these Task.tracked_values()."""
+    buckets = [
+        ('tasks_by_status', values.get('status')),
+        ('tasks_by_group', bucket_key(values.get('group_id'))),
+        ('tasks_per_manager', bucket_key(values.get('created_by_id'))),
+    ]
+    if values.get('completed_at') is not None:
+        day = timezone.localdate(values['completed_at'])
+        buckets.append(('completions_by_day', day.isoformat()))
+    return buckets
+
+
+def rollup_deltas(changes):
+    """
+    Per-bucket deltas for (old, new) pairs of tracked values; old is None
+    for a new task and new is None for a deleted one.
+    """
+    deltas = Counter()
+    for old, new in changes:
+        for values, sign in ((old, -1), (new, 1)):
+            if values is not None:
+                for bucket in task_buckets(values):
+                    deltas[bucket] += sign
+    return {bucket: delta for bucket, delta in deltas.items() if delta}
+
+
+def apply_task_changes(changes):
+    apply_deltas(rollup_deltas(changes))
+
+
+def apply_deltas(deltas):
+    deltas = {bucket: delta for bucket, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    AnalyticsRollup.objects.bulk_create(
+        [AnalyticsRollup(metric=metric, key=key) for metric, key in deltas],
+        ignore_conflicts=True
+    )
+    for (metric, key), delta in deltas.items():
+        AnalyticsRollup.objects.filter(metric=metric, key=key).update(count=F('count') + delta)
+
+
+def nulled_reference_deltas(metric, field, value):
+    """
+    Deltas for tasks whose `field` is about to be set to NULL by an
+    on_delete=SET_NULL cascade, which sends no task signals.
+    """
+    moved = Task.objects.filter(**{field: value}).count()
+    return {(metric, bucket_key(value)): -moved, (metric, bucket_key(None)): moved}
+
+
+def compute_rollups():
+    """Every bucket count, recomputed from the tasks table."""
+    tasks = Task.objects.order_by()
+    rollups = {}
+    for metric, field in (
+        ('tasks_by_status', 'status'),
+        ('tasks_by_group', 'group_id'),
+        ('tasks_per_manager', 'created_by_id'),
+    ):
+        for value, count in tasks.values(field).annotate(n=Count('id')).values_list(field, 'n'):
+            rollups[(metric, bucket_key(value))] = count
+
+    days = tasks.filter(completed_at__isnull=False).annotate(
+        day=TruncDate('completed_at')
+    ).values('day').annotate(n=Count('id')).values_list('day', 'n')
+    for day, count in days:
+        rollups[('completions_by_day', day.isoformat())] = count
+    return rollups
+
+
+@transaction.atomic
+def rebuild_rollups():
+    """
+    Replace the stored rollups with freshly computed ones. Returns the
+    number of buckets and how many of them had drifted from the stored value.
+    """
+    fresh = compute_rollups()
+    stored = {
+        (metric, key): count
+        for metric, key, count in AnalyticsRollup.objects.values_list('metric', 'key', 'count')
+    }
+    drifted = sum(
+        1 for bucket in set(fresh) | set(stored)
+        if fresh.get(bucket, 0) != stored.get(bucket, 0)
+    )
+    AnalyticsRollup.objects.all().delete()
+    AnalyticsRollup.objects.bulk_create([
+        AnalyticsRollup(metric=metric, key=key, count=count)
+        for (metric, key), count in fresh.items()
+    ])
+    return len(fresh), drifted
+
+
+def read_rollups(days_since=None):
+    """
+    {metric: {key: count}} for every non-empty bucket, in one query;
+    completions_by_day only from the `days_since` date on when given.
+    """
+    rows = AnalyticsRollup.objects.filter(count__gt=0)
+    if days_since is not None:
+        rows = rows.filter(~Q(metric='completions_by_day') | Q(key__gte=days_since.isoformat()))
+    rollups = {}
+    for metric, key, count in rows.values_list('metric', 'key', 'count'):
+        rollups.setdefault(metric, {})[key] = count
+    return rollups
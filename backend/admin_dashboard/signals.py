@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from tasks.models import Task, TaskGroup
+from tasks.signals import task_status_changed, tasks_bulk_changed
+from .rollups import apply_deltas, apply_task_changes, nulled_reference_deltas
+
+User = get_user_model()
+
+# Keep the analytics rollups in step with every task write
+
+
+@receiver(post_save, sender=Task)
+def task_saved_rollups(sender, instance, created, **kwargs):
+    old = None if created else instance.loaded_values() or None
+    apply_task_changes([(old, instance.tracked_values())])
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted_rollups(sender, instance, **kwargs):
+    apply_task_changes([(instance.tracked_values(), None)])
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def tasks_bulk_rollups(sender, created, updated, previous, **kwargs):
+    changes = [(None, task.tracked_values()) for task in created]
+    changes += [(previous[task.id], task.tracked_values()) for task in updated]
+    apply_task_changes(changes)
+
+
+@receiver(task_status_changed, sender=Task)
+def task_status_rollups(sender, task, **kwargs):
+    apply_task_changes([(task.loaded_values(), task.tracked_values())])
+
+
+# Deleting a group or user nulls Task.group/created_by in SQL without any
+# task signal, so move those tasks to the empty bucket up front
+
+
+@receiver(pre_delete, sender=TaskGroup)
+def group_deleted_rollups(sender, instance, **kwargs):
+    apply_deltas(nulled_reference_deltas('tasks_by_group', 'group_id', instance.pk))
+
+
+@receiver(pre_delete, sender=User)
+def user_deleted_rollups(sender, instance, **kwargs):
+    apply_deltas(nulled_reference_deltas('tasks_per_manager', 'created_by_id', instance.pk))
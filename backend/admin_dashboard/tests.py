@@ -1,3 +1,99 @@
-from django.test import TestCase
+import datetime
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from tasks.models import Task, TaskGroup
+from tasks.transitions import transition_status
+from .models import AnalyticsRollup
+from .rollups import compute_rollups
 
-# Create your tests here.
+User = get_user_model()
+
+
+class RollupConsistencyTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', role='manager')
+        self.group = TaskGroup.objects.create(name='Backend', created_by=self.manager)
+        self.tasks = [
+            Task.objects.create(title=f'Task {i}', group=self.group if i % 2 else None, created_by=self.manager)
+            for i in range(4)
+        ]
+
+    def assertRollupsMatchTasks(self):
+        stored = {
+            (metric, key): count
+            for metric, key, count in AnalyticsRollup.objects.exclude(count=0).values_list('metric', 'key', 'count')
+        }
+        self.assertEqual(stored, compute_rollups())
+
+    def test_updates_and_deletes_keep_rollups_in_step(self):
+        task = self.tasks[0]
+        task.status = 'completed'
+        task.group = self.group
+        task.save()
+        transition_status(Task.objects.get(pk=self.tasks[1].pk), 'completed')
+        self.tasks[2].delete()
+
+        self.assertRollupsMatchTasks()
+
+    def test_deleting_a_group_moves_its_tasks_to_no_group(self):
+        self.group.delete()
+        self.assertRollupsMatchTasks()
+
+    def test_deleting_a_manager_moves_their_tasks_to_no_creator(self):
+        self.manager.delete()
+        self.assertRollupsMatchTasks()
+
+    def test_saving_a_task_loaded_with_deferred_fields(self):
+        task = Task.objects.only('id', 'title').get(pk=self.tasks[1].pk)
+        task.title = 'Renamed'
+        task.save()
+
+        deferred = Task.objects.only('id', 'version').get(pk=self.tasks[3].pk)
+        transition_status(deferred, 'in_progress')
+
+        self.assertRollupsMatchTasks()
+
+
+@override_settings(DASHBOARD_CACHE_TIMEOUT=0)
+class TaskTrendTests(TestCase):
+    def setUp(self):
+        for day in ('2026-01-05', '2026-01-31', '2026-02-02', '2026-02-20', '2026-02-20', '2026-03-01'):
+            task = Task.objects.create(title=f'Task {day}')
+            created_at = timezone.make_aware(datetime.datetime.fromisoformat(f'{day}T12:00'))
+            Task.objects.filter(pk=task.pk).update(created_at=created_at)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='admin', role='admin'))
+
+    def trend(self, **params):
+        response = self.client.get('/api/admin-dashboard/trends/', {'metric': 'created', **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        series = [(str(row['period']), row['count']) for row in response.data['series']]
+        return str(response.data['from']), str(response.data['to']), series
+
+    def test_daily_buckets_include_empty_days(self):
+        self.assertEqual(self.trend(**{'from': '2026-01-30', 'to': '2026-02-02'}), (
+            '2026-01-30', '2026-02-02',
+            [('2026-01-30', 0), ('2026-01-31', 1), ('2026-02-01', 0), ('2026-02-02', 1)]
+        ))
+
+    def test_edge_buckets_are_counted_whole(self):
+        self.assertEqual(self.trend(granularity='month', **{'from': '2026-01-31', 'to': '2026-02-01'}), (
+            '2026-01-01', '2026-02-28', [('2026-01-01', 2), ('2026-02-01', 3)]
+        ))
+        self.assertEqual(self.trend(granularity='week', **{'from': '2026-02-01', 'to': '2026-02-03'}), (
+            '2026-01-26', '2026-02-08', [('2026-01-26', 1), ('2026-02-02', 1)]
+        ))
+
+    def test_invalid_ranges_are_rejected(self):
+        for params in (
+            {'from': '2026-02-02', 'to': '2026-02-01'},
+            {'from': '2024-01-01', 'to': '2026-01-01'},
+            {'granularity': 'year'},
+            {'metric': 'deleted'},
+        ):
+            response = self.client.get('/api/admin-dashboard/trends/', params)
+            self.assertEqual(response.status_code, 400, params)
+        response = self.client.get('/api/admin-dashboard/trends/', {'granularity': 'week', 'from': '2024-01-01', 'to': '2026-01-01'})
+        self.assertEqual(response.status_code, 200)
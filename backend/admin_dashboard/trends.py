@@ -0,0 +1,90 @@
+import datetime
+from django.db.models import Count, DateField
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from tasks.filters import parse_param
+from tasks.models import Task
+
+GRANULARITIES = ('day', 'week', 'month')
+# metric param -> indexed timestamp column it is bucketed on
+TREND_FIELDS = {
+    'created': 'created_at',
+    'completed': 'completed_at',
+}
+DEFAULT_DAYS = 30
+MAX_BUCKETS = 400
+
+
+def bucket_start(date, granularity):
+    # Weeks start on Monday, as with TruncWeek
+    if granularity == 'week':
+        return date - datetime.timedelta(days=date.weekday())
+    if granularity == 'month':
+        return date.replace(day=1)
+    return date
+
+
+def next_bucket(date, granularity):
+    if granularity == 'week':
+        return date + datetime.timedelta(days=7)
+    if granularity == 'month':
+        return (date.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+    return date + datetime.timedelta(days=1)
+
+
+def bucket_dates(start, end, granularity):
+    """Start date of every bucket between the start and end dates, inclusive."""
+    dates = []
+    date = bucket_start(start, granularity)
+    while date <= end:
+        dates.append(date)
+        date = next_bucket(date, granularity)
+    return dates
+
+
+def trend_params(params):
+    """
+    (metric, start, end, granularity) from the from/to/granularity/metric
+    params. The range is widened to whole buckets at both ends, so the first
+    and last periods are counted in full like every other one.
+    """
+    metric = params.get('metric', 'completed')
+    if metric not in TREND_FIELDS:
+        raise ValidationError({"metric": f"Must be one of {', '.join(TREND_FIELDS)}"})
+    granularity = params.get('granularity', 'day')
+    if granularity not in GRANULARITIES:
+        raise ValidationError({"granularity": f"Must be one of {', '.join(GRANULARITIES)}"})
+
+    end = parse_param(params, 'to', parse_date) or timezone.localdate()
+    start = parse_param(params, 'from', parse_date) or end - datetime.timedelta(days=DEFAULT_DAYS - 1)
+    if start > end:
+        raise ValidationError({"from": "Must not be after 'to'"})
+    dates = bucket_dates(start, end, granularity)
+    if len(dates) > MAX_BUCKETS:
+        raise ValidationError({"from": f"Range covers more than {MAX_BUCKETS} {granularity}s"})
+    return metric, dates[0], next_bucket(dates[-1], granularity) - datetime.timedelta(days=1), granularity
+
+
+def as_datetime(date):
+    return timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+
+
+def task_trend(metric, start, end, granularity):
+    """
+    Task counts per bucket between start and end (as widened by
+    trend_params), bucketed by the database over a range scan of the
+    metric's timestamp index. Empty buckets are included with a count of 0.
+    """
+    field = TREND_FIELDS[metric]
+    dates = bucket_dates(start, end, granularity)
+    rows = Task.objects.filter(**{
+        f'{field}__gte': as_datetime(start),
+        f'{field}__lt': as_datetime(end + datetime.timedelta(days=1)),
+    }).annotate(
+        period=Trunc(field, granularity, output_field=DateField())
+    ).order_by().values('period').annotate(count=Count('id')).values_list('period', 'count')
+
+    counts = dict(rows)
+    return [{"period": date, "count": counts.get(date, 0)} for date in dates]
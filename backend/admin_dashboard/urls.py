@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import AdminDashboardView,AdminAllUsersView, AdminAllTasksView,ChangeUserRoleView,DeleteUserView,AdminAnalyticsView
+from .views import AdminDashboardView,AdminAllUsersView, AdminAllTasksView,ChangeUserRoleView,DeleteUserView,AdminAnalyticsView,CacheStatsView,TaskTrendsView
 
 urlpatterns = [
     path('', AdminDashboardView.as_view(), name='admin-dashboard'),
@@ -8,4 +8,6 @@ urlpatterns = [
     path('change-role/', ChangeUserRoleView.as_view(), name='change-user-role'),
     path('delete-user/<int:user_id>/', DeleteUserView.as_view(), name='delete-user'),
     path('analytics/', AdminAnalyticsView.as_view(), name='admin-analytics'),
+    path('trends/', TaskTrendsView.as_view(), name='admin-task-trends'),
+    path('cache-stats/', CacheStatsView.as_view(), name='admin-cache-stats'),
 ]
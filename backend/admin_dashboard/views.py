@@ -1,9 +1,14 @@
+import datetime
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import get_user_model
 from tasks.models import Task, TaskGroup
+from dashboard.cache import cache_stats, cached_response
+from dashboard.widgets import build_widget
 from rest_framework import status
+from .rollups import read_rollups
+from .trends import DEFAULT_DAYS, task_trend, trend_params
 from .serializers import AdminUserSerializer, AdminTaskSerializer,ChangeUserRoleSerializer
 from users.permissions import IsAdmin, IsAdminOrManager, IsAdminManagerOrClient
 from django.db.models import Count, Q, Avg
@@ -14,27 +19,15 @@ User = get_user_model()
 class AdminDashboardView(APIView):
     permission_classes = [IsAuthenticated, IsAdminOrManager]
 
+    @cached_response(scope='role')
     def get(self, request):
-        total_employees = User.objects.filter(Q(role='employee') | Q(role='client')).count()
-        total_managers = User.objects.filter(role='manager').count()
-        total_tasks = Task.objects.count()
-        completed_tasks = Task.objects.filter(status='completed').count()
-        active_tasks = Task.objects.filter(status__in=['todo', 'in_progress']).count()
-        total_projects = TaskGroup.objects.count()
-
-        return Response({
-            "total_employees": total_employees,
-            "total_managers": total_managers,
-            "total_tasks": total_tasks,
-            "total_projects": total_projects,
-            "completed_tasks": completed_tasks,
-            "active_tasks": active_tasks
-        })
+        return Response(build_widget('admin_summary'))
 
 
 class AdminAllUsersView(APIView):
     permission_classes = [IsAuthenticated, IsAdminManagerOrClient]
 
+    @cached_response(scope='role')
     def get(self, request):
         users = User.objects.all()
         serializer = AdminUserSerializer(users, many=True)
@@ -43,11 +36,18 @@ class AdminAllUsersView(APIView):
 class AdminAllTasksView(APIView):
     permission_classes = [IsAuthenticated, IsAdminOrManager]
 
+    @cached_response(scope='role')
     def get(self, request):
         tasks = Task.objects.prefetch_related('assigned_to').all()
         serializer = AdminTaskSerializer(tasks, many=True)
         return Response(serializer.data)
 
+class CacheStatsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        return Response(cache_stats())
+
 class ChangeUserRoleView(APIView):
     permission_classes = [IsAuthenticated, IsAdmin]
 
@@ -76,18 +76,52 @@ class DeleteUserView(APIView):
         except User.DoesNotExist:
             return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
 
+class TaskTrendsView(APIView):
+    """
+    Tasks created or completed (`metric`, default completed) per day, week
+    or month (`granularity`) between `from` and `to` (default: the last 30
+    days), with empty periods included. The range is widened to whole
+    periods and the returned `from`/`to` are the dates actually covered.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    @cached_response(scope='role')
+    def get(self, request):
+        metric, start, end, granularity = trend_params(request.query_params)
+        return Response({
+            "metric": metric,
+            "granularity": granularity,
+            "from": start,
+            "to": end,
+            "series": task_trend(metric, start, end, granularity)
+        })
+
 class AdminAnalyticsView(APIView):
+    """
+    Task breakdowns come from the AnalyticsRollup rows; overdue counts
+    depend on today's date and user breakdowns are on the small users
+    table, so those are still queried live.
+    """
     permission_classes = [IsAuthenticated, IsAdmin]
 
+    @cached_response(scope='role')
     def get(self, request):
         today = now().date()
 
-        total_admins = User.objects.filter(role='admin').count()
-        total_managers = User.objects.filter(role='manager').count()
-        total_employees = User.objects.filter(role='employee').count()
+        roles = User.objects.aggregate(
+            total_admins=Count('id', filter=Q(role='admin')),
+            total_managers=Count('id', filter=Q(role='manager')),
+            total_employees=Count('id', filter=Q(role='employee'))
+        )
 
-        employees_with_tasks = User.objects.filter(role='employee', tasks__isnull=False).distinct().count()
-        inactive_employees = total_employees - employees_with_tasks
+        tasks_by_employee = [
+            {"employee": username, "tasks_count": count}
+            for username, count in User.objects.filter(role='employee').annotate(
+                tasks_count=Count('tasks')
+            ).values_list('username', 'tasks_count')
+        ]
+        employees_with_tasks = sum(1 for row in tasks_by_employee if row['tasks_count'])
+        inactive_employees = roles['total_employees'] - employees_with_tasks
 
         employees_per_department = User.objects.filter(role='employee')\
             .values('department')\
@@ -97,49 +131,47 @@ class AdminAnalyticsView(APIView):
             .values('tasks__group__name')\
             .annotate(count=Count('id', distinct=True))
 
-        total_tasks = Task.objects.count()
-        tasks_by_status = Task.objects.values('status').annotate(count=Count('id'))
-
-        overdue_tasks = Task.objects.filter(status__in=['todo','in_progress'], due_date__lt=today)
-
-        tasks_by_group = Task.objects.values('group__name')\
-            .annotate(count=Count('id'))
-
-        tasks_by_employee = [
-            {"employee": u.username, "tasks_count": u.tasks.count()} 
-            for u in User.objects.filter(role='employee')
-        ]
-
-        task_completion_trends = Task.objects.filter(status='completed').extra({
-            'day': "date(created_at)"
-        }).values('day').annotate(count=Count('id')).order_by('day')
-
-        tasks_per_manager = Task.objects.values('created_by__username').annotate(total_tasks=Count('id'))
-
-        overdue_per_manager = Task.objects.filter(
+        overdue_per_manager = list(Task.objects.filter(
             status__in=['todo','in_progress'], due_date__lt=today
-        ).values('created_by__username').annotate(overdue_tasks=Count('id'))
+        ).values('created_by__username').annotate(overdue_tasks=Count('id')))
+
+        # The full history is available from TaskTrendsView
+        rollups = read_rollups(days_since=today - datetime.timedelta(days=DEFAULT_DAYS - 1))
+        by_status = rollups.get('tasks_by_status', {})
+        by_group = rollups.get('tasks_by_group', {})
+        per_manager = rollups.get('tasks_per_manager', {})
+        group_names = dict(TaskGroup.objects.filter(id__in=[k for k in by_group if k]).values_list('id', 'name'))
+        usernames = dict(User.objects.filter(id__in=[k for k in per_manager if k]).values_list('id', 'username'))
 
         return Response({
             "user_role_analytics": {
-                "total_admins": total_admins,
-                "total_managers": total_managers,
-                "total_employees": total_employees,
+                **roles,
                 "active_employees": employees_with_tasks,
                 "inactive_employees": inactive_employees,
                 "employees_per_department": list(employees_per_department),
                 "employees_per_group": list(employees_per_group),
             },
             "task_analytics": {
-                "total_tasks": total_tasks,
-                "tasks_by_status": list(tasks_by_status),
-                "overdue_tasks_count": overdue_tasks.count(),
-                "tasks_by_group": list(tasks_by_group),
+                "total_tasks": sum(by_status.values()),
+                "tasks_by_status": [
+                    {"status": key, "count": count} for key, count in sorted(by_status.items())
+                ],
+                "overdue_tasks_count": sum(row['overdue_tasks'] for row in overdue_per_manager),
+                "tasks_by_group": [
+                    {"group__name": group_names.get(int(key)) if key else None, "count": count}
+                    for key, count in sorted(by_group.items())
+                ],
                 "tasks_by_employee": tasks_by_employee,
-                "task_completion_trends": list(task_completion_trends),
+                "task_completion_trends": [
+                    {"day": datetime.date.fromisoformat(key), "count": count}
+                    for key, count in sorted(rollups.get('completions_by_day', {}).items())
+                ],
             },
             "manager_analytics": {
-                "tasks_per_manager": list(tasks_per_manager),
-                "overdue_tasks_per_manager": list(overdue_per_manager),
+                "tasks_per_manager": [
+                    {"created_by__username": usernames.get(int(key)) if key else None, "total_tasks": count}
+                    for key, count in sorted(per_manager.items())
+                ],
+                "overdue_tasks_per_manager": overdue_per_manager,
             }
         })
@@ -0,0 +1,133 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist, FieldError
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination on a stable, unique sort key such as
+    ('-created_at', '-id').
+
+    The cursor is an opaque token holding the sort-key values of the last row
+    on the page, so the next page is a single indexed range scan instead of
+    an OFFSET. Sort-key fields must be non-null. The page body stays a plain
+    list and the cursor travels in the X-Next-Cursor header.
+    """
+    header = 'X-Next-Cursor'
+
+    def __init__(self, ordering, default_limit=50, max_limit=200):
+        self.ordering = tuple(ordering)
+        self.fields = [field.lstrip('-') for field in self.ordering]
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+
+    def encode(self, values):
+        values = [v.isoformat() if isinstance(v, (datetime.date, datetime.datetime)) else v for v in values]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode(self, cursor, queryset=None):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, ValueError, UnicodeDecodeError):
+            raise ValidationError({"cursor": "Invalid cursor"})
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise ValidationError({"cursor": "Invalid cursor"})
+        return [self.to_python(queryset, name, value) for name, value in zip(self.fields, values)]
+
+    def sort_field(self, queryset, name):
+        """The model field or annotation output field behind a sort key, if known."""
+        if queryset is None:
+            return None
+        annotation = queryset.query.annotations.get(name)
+        try:
+            if annotation is not None:
+                return annotation.output_field
+            return queryset.model._meta.get_field(name)
+        except (FieldDoesNotExist, FieldError):
+            return None
+
+    def to_python(self, queryset, name, value):
+        # Sort keys are never null, and a bool would pass as an integer
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValidationError({"cursor": "Invalid cursor"})
+        field = self.sort_field(queryset, name)
+        if field is None:
+            return value
+        try:
+            return field.to_python(value)
+        except (DjangoValidationError, TypeError, ValueError):
+            raise ValidationError({"cursor": "Invalid cursor"})
+
+    def get_limit(self, request):
+        limit = request.query_params.get('limit')
+        if limit is None:
+            return self.default_limit
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer"})
+        return max(1, min(limit, self.max_limit))
+
+    def after(self, cursor, queryset=None):
+        """
+        Q matching rows that sort strictly after the cursor position. Pass
+        the queryset being paged so each value is checked against its field.
+        """
+        values = self.decode(cursor, queryset)
+        condition = Q()
+        equal = {}
+        for field, name, value in zip(self.ordering, self.fields, values):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def key(self, row):
+        if isinstance(row, dict):
+            return [row[name] for name in self.fields]
+        return [getattr(row, name) for name in self.fields]
+
+    def paginate(self, queryset, request):
+        return self.page(queryset, request.query_params.get('cursor'), self.get_limit(request))
+
+    def page(self, queryset, cursor, limit):
+        """One page of `limit` rows after `cursor` (None for the first page)."""
+        queryset = queryset.order_by(*self.ordering)
+        if cursor:
+            queryset = queryset.filter(self.after(cursor, queryset))
+
+        rows = list(queryset[:limit + 1])
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode(self.key(rows[-1]))
+        return rows, next_cursor
+
+    def get_response(self, data, next_cursor):
+        response = Response(data)
+        if next_cursor:
+            response[self.header] = next_cursor
+        return response
+
+
+class KeysetPagination(BasePagination):
+    """DRF pagination class wrapping KeysetPaginator, for generic views and viewsets."""
+    ordering = ('id',)
+    default_limit = 50
+    max_limit = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = KeysetPaginator(self.ordering, self.default_limit, self.max_limit)
+        page, self.next_cursor = self.paginator.paginate(queryset, request)
+        return page
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_response(data, self.next_cursor)
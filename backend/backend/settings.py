@@ -45,6 +45,7 @@ INSTALLED_APPS = [
     'admin_dashboard',
     'employee_dashboard',
     'reports',
+    'jobs',
 ]
 SITE_ID = 1
 
@@ -155,6 +156,7 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='test@example.com')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='password')
 
 CORS_ALLOW_ALL_ORIGINS = True
+CORS_EXPOSE_HEADERS = ['X-Next-Cursor']
 
 SOCIALACCOUNT_PROVIDERS = {
     'google': {
@@ -171,6 +173,67 @@ SOCIALACCOUNT_PROVIDERS = {
 ACCOUNT_EMAIL_VERIFICATION = 'none'
 REST_USE_JWT = True
 
+# Local memory by default; with several worker processes point this at a
+# shared cache (e.g. FileBasedCache on one host) so invalidation reaches all
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='group2'),
+    }
+}
+
+# Seconds a dashboard response is cached for (0 disables the cache)
+DASHBOARD_CACHE_TIMEOUT = config('DASHBOARD_CACHE_TIMEOUT', default=300, cast=int)
+
+# Full-text search for global_search (see search.backends). Empty picks by
+# database: SQLiteFTSBackend on SQLite, LikeSearchBackend anywhere else
+SEARCH_BACKEND = config('SEARCH_BACKEND', default='')
+
+# Seconds before a worker rebuilds its in-memory autocomplete index; signals
+# only update the index of the process that made the change
+AUTOCOMPLETE_MAX_AGE = config('AUTOCOMPLETE_MAX_AGE', default=300, cast=int)
+
+# Keep TaskGroup.total_tasks/completed_tasks up to date on every task change
+# so group progress is read from the row; run rebuild_group_counters after
+# switching this on
+TASK_GROUP_COUNTERS = config('TASK_GROUP_COUNTERS', default=True, cast=bool)
+
+# Task update notifications for the same user, task and type that arrive
+# within this many seconds of the last one merged into an unread row are
+# merged into it too, moving it to the top of the inbox (0 disables)
+NOTIFICATION_COALESCE_WINDOW = config('NOTIFICATION_COALESCE_WINDOW', default=300, cast=int)
+
+# Age in days after which read notifications are removed by purge_notifications,
+# per notif_type; 'default' covers every type not listed
+NOTIFICATION_RETENTION_DAYS = {
+    'default': 90,
+    'task_updated': 30,
+    'admin_task_created': 30,
+    'admin_task_updated': 30,
+}
+# Move purged notifications into ArchivedNotification instead of dropping them
+NOTIFICATION_ARCHIVE = config('NOTIFICATION_ARCHIVE', default=False, cast=bool)
+
+# Pub/sub broker behind the notification stream (see notifications.broker).
+# DatabaseBroker polls the notifications table (one poller thread per
+# process for all its streams), so it works whichever process (web or
+# run_worker) wrote the rows; InMemoryBroker only reaches streams served by
+# the process that wrote them
+NOTIFICATION_BROKER = config('NOTIFICATION_BROKER', default='notifications.broker.DatabaseBroker')
+# Seconds between polls of the notifications table by each process's poller
+NOTIFICATION_STREAM_POLL_INTERVAL = 2
+# Seconds between keep-alive comments on an idle notification stream
+NOTIFICATION_STREAM_HEARTBEAT = 25
+
+# Background jobs (see jobs.queue); run them with `manage.py run_worker`.
+# JOBS_EAGER runs each job in-process right after the request commits instead.
+JOBS_EAGER = config('JOBS_EAGER', default=False, cast=bool)
+JOBS_MAX_ATTEMPTS = 5
+# Seconds before the first retry, doubled on every further attempt
+JOBS_RETRY_BACKOFF = 10
+# Seconds after which a running job whose worker vanished can be claimed again
+JOBS_LOCK_TIMEOUT = 600
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_wsgi_application()
+
+# Build this worker's autocomplete index now rather than on the first request
+from search.autocomplete import autocomplete_index  # noqa: E402
+
+autocomplete_index.warm()
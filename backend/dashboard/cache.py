@@ -0,0 +1,87 @@
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+# Every cached dashboard response is keyed with the current data version;
+# bumping it on any task, group or user change orphans all older entries,
+# which then expire on their own.
+VERSION_KEY = 'dashboard:version'
+HITS_KEY = 'dashboard:hits'
+MISSES_KEY = 'dashboard:misses'
+
+
+def incr(key, initial):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, initial, timeout=None)
+        return cache.get(key, initial)
+
+
+def data_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Start from the clock so an evicted version never reuses old keys
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    incr(VERSION_KEY, time.time_ns())
+
+
+def cache_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+    }
+
+
+def response_key(request, scope):
+    """Cache key for the request path and query params, per role or per user."""
+    owner = f'user:{request.user.id}' if scope == 'user' else f'role:{request.user.role}'
+    params = urlencode(sorted(request.query_params.lists()), doseq=True)
+    digest = hashlib.sha256(f'{request.path}?{params}'.encode()).hexdigest()
+    return f'dashboard:{data_version()}:{owner}:{digest}'
+
+
+def cached_response(scope='role'):
+    """
+    Cache successful responses of an APIView get() for DASHBOARD_CACHE_TIMEOUT
+    seconds. scope='role' shares entries between users with the same role,
+    scope='user' keeps them per user.
+    """
+    def decorator(get):
+        @wraps(get)
+        def wrapper(view, request, *args, **kwargs):
+            timeout = settings.DASHBOARD_CACHE_TIMEOUT
+            if not timeout:
+                return get(view, request, *args, **kwargs)
+
+            key = response_key(request, scope)
+            cached = cache.get(key)
+            if cached is not None:
+                incr(HITS_KEY, 1)
+                data, headers = cached
+                response = Response(data)
+                for header, value in headers:
+                    response[header] = value
+                return response
+
+            incr(MISSES_KEY, 1)
+            response = get(view, request, *args, **kwargs)
+            if response.status_code == 200:
+                headers = [(h, v) for h, v in response.items() if h.lower() != 'content-type']
+                cache.set(key, (response.data, headers), timeout)
+            return response
+        return wrapper
+    return decorator
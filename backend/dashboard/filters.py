@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Exists, OuterRef, Q, Window
+from django.utils.dateparse import parse_date
+from backend.pagination import KeysetPaginator
+from tasks.filters import STATUSES, parse_int, parse_param
+from tasks.models import Task
+
+User = get_user_model()
+TaskAssignment = Task.assigned_to.through
+
+
+def parse_status(value):
+    return value if value in STATUSES else None
+
+
+def has_task(**lookups):
+    # EXISTS instead of joining tasks, so one employee stays one row
+    return Exists(TaskAssignment.objects.filter(user_id=OuterRef('pk'), **lookups))
+
+
+# query param -> (parser, condition for the parsed value)
+EMPLOYEE_FILTERS = {
+    'department': (str, lambda v: Q(department__icontains=v)),
+    'min_tasks': (parse_int, lambda v: Q(task_count__gte=v)),
+    'max_tasks': (parse_int, lambda v: Q(task_count__lte=v)),
+    'task_status': (parse_status, lambda v: Q(has_task(task__status=v))),
+    'joined_after': (parse_date, lambda v: Q(date_joined__date__gte=v)),
+    'joined_before': (parse_date, lambda v: Q(date_joined__date__lte=v)),
+    'group': (parse_int, lambda v: Q(has_task(task__group_id=v))),
+}
+
+EMPLOYEE_FIELDS = ('id', 'username', 'email', 'department', 'phone', 'task_count', 'date_joined')
+
+
+def filter_employees(params):
+    """Employees with a task_count, narrowed by every EMPLOYEE_FILTERS param given."""
+    conditions = Q()
+    for name, (parser, condition) in EMPLOYEE_FILTERS.items():
+        value = parse_param(params, name, parser)
+        if value is not None:
+            conditions &= condition(value)
+    return User.objects.filter(role='employee').annotate(
+        task_count=Count('tasks')
+    ).filter(conditions)
+
+
+def employee_paginator():
+    return KeysetPaginator(ordering=('id',), default_limit=50, max_limit=200)
+
+
+def employee_page(employees, paginator, request):
+    """
+    One keyset page of employee rows, its next cursor and the total number
+    of matches. The first page reads the total from a window count in the
+    same query; later pages need one COUNT.
+    """
+    cursor = request.query_params.get('cursor')
+    limit = paginator.get_limit(request)
+    if cursor:
+        rows, next_cursor = paginator.page(employees.values(*EMPLOYEE_FIELDS), cursor, limit)
+        return rows, next_cursor, employees.count()
+
+    rows, next_cursor = paginator.page(
+        employees.annotate(total=Window(Count('id'))).values(*EMPLOYEE_FIELDS, 'total'), None, limit
+    )
+    total = rows[0]['total'] if rows else 0
+    for row in rows:
+        del row['total']
+    return rows, next_cursor, total
+
+
+def employees_per_group(employees):
+    return User.objects.filter(
+        id__in=employees.values('id'), tasks__group__isnull=False
+    ).values('tasks__group__name').annotate(count=Count('id', distinct=True))
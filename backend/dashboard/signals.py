@@ -0,0 +1,42 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from tasks.models import Task, TaskGroup
+from tasks.signals import task_status_changed, tasks_bulk_changed
+from .cache import bump_version
+
+User = get_user_model()
+
+# Any change to the data behind the dashboards invalidates their cached
+# responses once it is committed
+
+
+def invalidate(action='post_save', **kwargs):
+    # m2m_changed also fires pre_* actions; only react once the rows changed
+    if action.startswith('post_'):
+        transaction.on_commit(bump_version)
+
+
+for model in (Task, TaskGroup):
+    post_save.connect(invalidate, sender=model, dispatch_uid=f'dashboard_cache_save_{model.__name__}')
+    post_delete.connect(invalidate, sender=model, dispatch_uid=f'dashboard_cache_delete_{model.__name__}')
+
+for through in (Task.assigned_to.through, TaskGroup.members.through):
+    m2m_changed.connect(invalidate, sender=through, dispatch_uid=f'dashboard_cache_m2m_{through.__name__}')
+
+tasks_bulk_changed.connect(invalidate, sender=Task, dispatch_uid='dashboard_cache_bulk')
+task_status_changed.connect(invalidate, sender=Task, dispatch_uid='dashboard_cache_status')
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, update_fields=None, **kwargs):
+    # Logging in only touches last_login, which no dashboard shows
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    transaction.on_commit(bump_version)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, **kwargs):
+    transaction.on_commit(bump_version)
@@ -1,3 +1,111 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from tasks.models import Task, TaskGroup
+from tasks.transitions import transition_status
+from .cache import cache_stats, data_version
 
-# Create your tests here.
+User = get_user_model()
+
+
+@override_settings(JOBS_EAGER=False, DASHBOARD_CACHE_TIMEOUT=300)
+class DashboardCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employee = User.objects.create_user(username='employee', role='employee')
+        self.task = Task.objects.create(title='Write report')
+        self.task.assigned_to.add(self.employee)
+        self.client = APIClient()
+        self.client.force_authenticate(self.employee)
+
+    def completed_tasks(self):
+        response = self.client.get('/api/employee-dashboard/home/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['overview']['completed_tasks']
+
+    def test_a_committed_transition_invalidates_cached_responses(self):
+        self.assertEqual(self.completed_tasks(), 0)
+        self.assertEqual(self.completed_tasks(), 0)
+        self.assertEqual(cache_stats()['hits'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            transition_status(Task.objects.get(pk=self.task.pk), 'completed')
+
+        self.assertEqual(self.completed_tasks(), 1)
+
+    def test_a_rolled_back_transition_invalidates_nothing(self):
+        self.assertEqual(self.completed_tasks(), 0)
+        version = data_version()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                transition_status(Task.objects.get(pk=self.task.pk), 'completed')
+                raise RuntimeError
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(data_version(), version)
+        self.assertEqual(self.completed_tasks(), 0)
+        self.assertEqual(cache_stats()['hits'], 1)
+
+
+@override_settings(JOBS_EAGER=False, DASHBOARD_CACHE_TIMEOUT=0)
+class EmployeeFilterTests(TestCase):
+    def setUp(self):
+        manager = User.objects.create_user(username='manager', role='manager')
+        self.employees = [User.objects.create_user(username=f'e{i}', role='employee') for i in range(5)]
+        self.platform = TaskGroup.objects.create(name='Platform')
+        self.design = TaskGroup.objects.create(name='Design')
+        # employee -> (group, status) of each assigned task
+        assignments = [
+            [(self.platform, 'completed'), (self.platform, 'todo'), (self.platform, 'todo')],
+            [(self.platform, 'todo'), (self.platform, 'todo')],
+            [(self.platform, 'completed')],
+            [(self.design, 'completed'), (self.design, 'todo'), (None, 'todo')],
+            [],
+        ]
+        for employee, tasks in zip(self.employees, assignments):
+            for group, status in tasks:
+                Task.objects.create(title='Task', group=group, status=status).assigned_to.add(employee)
+        self.client = APIClient()
+        self.client.force_authenticate(manager)
+
+    def get(self, endpoint, **params):
+        response = self.client.get(f'/api/dashboard/{endpoint}/', params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_total_with_task_count_and_task_filters(self):
+        params = {'group': self.platform.id, 'task_status': 'completed', 'min_tasks': 2}
+        for endpoint in ('filter_employees', 'task_filter'):
+            with self.subTest(endpoint=endpoint):
+                response = self.get(endpoint, **params)
+                self.assertEqual(response.data['total'], 1)
+                self.assertEqual([(e['username'], e['task_count']) for e in response.data['employees']], [('e0', 3)])
+
+        response = self.get('task_filter', **params)
+        self.assertEqual(list(response.data['employees_per_group']), [{'tasks__group__name': 'Platform', 'count': 1}])
+
+    def test_task_count_range(self):
+        response = self.get('filter_employees', min_tasks=1, max_tasks=2)
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual([e['username'] for e in response.data['employees']], ['e1', 'e2'])
+
+    def test_later_pages_keep_the_total(self):
+        for endpoint in ('filter_employees', 'task_filter'):
+            with self.subTest(endpoint=endpoint):
+                first = self.get(endpoint, min_tasks=2, limit=2)
+                second = self.get(endpoint, min_tasks=2, limit=2, cursor=first['X-Next-Cursor'])
+
+                self.assertEqual((first.data['total'], second.data['total']), (3, 3))
+                self.assertEqual(
+                    [e['username'] for e in first.data['employees'] + second.data['employees']],
+                    ['e0', 'e1', 'e3']
+                )
+                self.assertNotIn('X-Next-Cursor', second)
+
+        self.assertEqual(
+            sorted((row['tasks__group__name'], row['count']) for row in second.data['employees_per_group']),
+            [('Design', 1), ('Platform', 2)]
+        )
@@ -5,7 +5,8 @@ from .views import (
     EmployeeHistoryView,
     TaskStatsView,
     TaskFilterView,
-    AnalyticsSimpleView
+    AnalyticsSimpleView,
+    DashboardWidgetsView
 )
 
 urlpatterns = [
@@ -15,4 +16,5 @@ urlpatterns = [
     path('task_stats/', TaskStatsView.as_view(), name="task-stats"),
     path('task_filter/', TaskFilterView.as_view(), name="task-filter"),
     path('analytics_simple/', AnalyticsSimpleView.as_view(), name="analytics-simple"),
+    path('widgets/', DashboardWidgetsView.as_view(), name="dashboard-widgets"),
 ]
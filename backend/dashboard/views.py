@@ -2,12 +2,18 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import get_user_model
-from django.db.models import Count, Q
+from django.db.models import Q
 from django.utils.timezone import now
 from django.shortcuts import get_object_or_404
 from tasks.models import Task
 from tasks.serializers import TaskSerializer
+from tasks.visibility import assigned_tasks
 from users.permissions import IsAdminOrManager
+from rest_framework.exceptions import ValidationError
+from backend.pagination import KeysetPaginator
+from .cache import cached_response
+from .widgets import build_widget, build_widgets, parse_widgets
+from .filters import employee_page, employee_paginator, employees_per_group, filter_employees
 
 User = get_user_model()
 
@@ -21,67 +27,55 @@ TASK_PROGRESS = {
 def task_progress(status):
     return TASK_PROGRESS.get(status, 0)
 
-def total_employees_count():
-    return User.objects.filter(role='employee').count()
+def task_details(rows):
+    """Detail dicts for task values() rows, with assignee names from one query."""
+    assignees = {}
+    for task_id, username in Task.assigned_to.through.objects.filter(
+        task_id__in=[row['id'] for row in rows]
+    ).values_list('task_id', 'user__username'):
+        assignees.setdefault(task_id, []).append(username)
+
+    return [
+        {
+            "id": row['id'],
+            "title": row['title'],
+            "assigned_to": assignees.get(row['id'], []),
+            "status": row['status'],
+            "progress_percentage": task_progress(row['status']),
+            "due_date": row['due_date']
+        } for row in rows
+    ]
 
 class TotalEmployeeView(APIView):
     permission_classes = [IsAuthenticated, IsAdminOrManager]
 
+    @cached_response(scope='role')
     def get(self, request):
-        return Response({
-            "total_employees": total_employees_count()
-        })
+        return Response(build_widget('total_employees'))
 
 class FilterEmployeesView(APIView):
+    """Filters in dashboard.filters.EMPLOYEE_FILTERS; cursor paginated on id."""
     permission_classes = [IsAuthenticated, IsAdminOrManager]
 
+    @cached_response(scope='role')
     def get(self, request):
-        employees = User.objects.filter(role='employee').annotate(
-            task_count=Count('tasks', distinct=True)
-        )
-
-        qp = request.query_params
-        if qp.get('department'):
-            employees = employees.filter(department__icontains=qp['department'])
-
-        if qp.get('min_tasks'):
-            employees = employees.filter(task_count__gte=int(qp['min_tasks']))
-
-        if qp.get('max_tasks'):
-            employees = employees.filter(task_count__lte=int(qp['max_tasks']))
-
-        if qp.get('task_status'):
-            employees = employees.filter(tasks__status=qp['task_status']).distinct()
-
-        if qp.get('joined_after'):
-            employees = employees.filter(date_joined__date__gte=qp['joined_after'])
-
-        if qp.get('joined_before'):
-            employees = employees.filter(date_joined__date__lte=qp['joined_before'])
-        
-        if qp.get('group'):
-            employees = employees.filter(tasks__group__id=qp['group'])
-
+        employees = filter_employees(request.query_params)
+        paginator = employee_paginator()
+        rows, next_cursor, total = employee_page(employees, paginator, request)
 
-
-        data = list(employees.values(
-            'id', 'username', 'email', 'department', 'phone', 'task_count', 'date_joined'
-        ))
-
-        return Response({
-            "total": employees.count(),
-            "employees": data
-        })
+        return paginator.get_response({
+            "total": total,
+            "employees": rows
+        }, next_cursor)
 
 class EmployeeHistoryView(APIView):
     permission_classes = [IsAuthenticated, IsAdminOrManager]
 
+    @cached_response(scope='role')
     def get(self, request, employee_id):
         employee = get_object_or_404(User, id=employee_id, role='employee')
 
-        tasks = Task.objects.filter(
-            assigned_to=employee
-        ).select_related('group', 'created_by').order_by('-created_at')
+        tasks = assigned_tasks(employee).select_related('group', 'created_by').order_by('-created_at')
 
         task_list = [
             {
@@ -104,98 +98,73 @@ class EmployeeHistoryView(APIView):
         })
 
 class TaskStatsView(APIView):
+    """
+    Counts always; detail lists only for the sections named in `details`
+    (comma separated: active, overdue, completed). Each section returns up
+    to `limit` tasks (default 20, max 100) and a `<section>_next_cursor`
+    to pass back as `<section>_cursor` for its next page.
+    """
     permission_classes = [IsAuthenticated, IsAdminOrManager]
 
+    @cached_response(scope='role')
     def get(self, request):
         today = now().date()
-        tasks = Task.objects.prefetch_related('assigned_to')
-
-        active_tasks = tasks.filter(status__in=['todo', 'in_progress'])
-        overdue_tasks = active_tasks.filter(due_date__lt=today)
-        completed_tasks = tasks.filter(status='completed')
-
-        def task_details(task_queryset):
-            return [
-                {
-                    "id": t.id,
-                    "title": t.title,
-                    "assigned_to": [u.username for u in t.assigned_to.all()],
-                    "status": t.status,
-                    "progress_percentage": task_progress(t.status),
-                    "due_date": t.due_date
-                } for t in task_queryset
-            ]
-
-        return Response({
-            "total_tasks": tasks.count(),
-            "active_tasks_count": active_tasks.count(),
-            "overdue_tasks_count": overdue_tasks.count(),
-            "completed_tasks_count": completed_tasks.count(),
-            "active_task_details": task_details(active_tasks),
-            "overdue_task_details": task_details(overdue_tasks),
-            "completed_task_details": task_details(completed_tasks),
-        })
+        active = Q(status__in=['todo', 'in_progress'])
+        overdue = active & Q(due_date__lt=today)
+        completed = Q(status='completed')
+        sections = {'active': active, 'overdue': overdue, 'completed': completed}
+
+        details = request.query_params.get('details')
+        details = details.split(',') if details else []
+        unknown = set(details) - set(sections)
+        if unknown:
+            raise ValidationError({"details": f"Must be any of {', '.join(sections)}"})
+
+        data = build_widget('task_stats')
+        paginator = KeysetPaginator(ordering=('id',), default_limit=20, max_limit=100)
+        limit = paginator.get_limit(request)
+        for section in dict.fromkeys(details):
+            rows, next_cursor = paginator.page(
+                Task.objects.filter(sections[section]).values('id', 'title', 'status', 'due_date'),
+                request.query_params.get(f'{section}_cursor'),
+                limit
+            )
+            data[f'{section}_task_details'] = task_details(rows)
+            data[f'{section}_next_cursor'] = next_cursor
+
+        return Response(data)
 
 class TaskFilterView(APIView):
+    """Same filters and pagination as FilterEmployeesView, plus employees_per_group."""
     permission_classes = [IsAuthenticated, IsAdminOrManager]
 
+    @cached_response(scope='role')
     def get(self, request):
-        employees = User.objects.filter(role='employee').annotate(
-            task_count=Count('tasks', distinct=True)
-        )
-
-        qp = request.query_params
+        employees = filter_employees(request.query_params)
+        paginator = employee_paginator()
+        rows, next_cursor, total = employee_page(employees, paginator, request)
 
-        if qp.get('department'):
-            employees = employees.filter(department__icontains=qp['department'])
-
-        if qp.get('min_tasks'):
-            employees = employees.filter(task_count__gte=int(qp['min_tasks']))
-
-        if qp.get('max_tasks'):
-            employees = employees.filter(task_count__lte=int(qp['max_tasks']))
-
-        if qp.get('task_status'):
-            employees = employees.filter(tasks__status=qp['task_status']).distinct()
-
-        if qp.get('joined_after'):
-            employees = employees.filter(date_joined__date__gte=qp['joined_after'])
-
-        if qp.get('joined_before'):
-            employees = employees.filter(date_joined__date__lte=qp['joined_before'])
-
-        if qp.get('group'):
-            employees = employees.filter(tasks__group__id=qp['group']).distinct()
-
-        data = list(employees.values(
-            'id', 'username', 'email', 'department', 'phone', 'task_count', 'date_joined'
-        ))
-
-        employees_per_group = employees.filter(tasks__group__isnull=False) \
-            .values('tasks__group__name') \
-            .annotate(count=Count('id', distinct=True))
-
-        return Response({
-            "total": employees.count(),
-            "employees": data,
-            "employees_per_group": list(employees_per_group)
-        })
+        return paginator.get_response({
+            "total": total,
+            "employees": rows,
+            "employees_per_group": list(employees_per_group(employees))
+        }, next_cursor)
 
 class AnalyticsSimpleView(APIView):
     permission_classes = [IsAuthenticated, IsAdminOrManager]
 
+    @cached_response(scope='role')
     def get(self, request):
-        today = now().date()
-        total_employees = total_employees_count()
-
-        counts = Task.objects.aggregate(
-            total_tasks=Count('id'),
-            active_tasks=Count('id', filter=Q(status__in=['todo', 'in_progress'])),
-            completed_tasks=Count('id', filter=Q(status='completed')),
-            overdue_tasks=Count('id', filter=Q(status__in=['todo', 'in_progress'], due_date__lt=today))
-        )
+        return Response(build_widget('analytics_simple'))
+
+class DashboardWidgetsView(APIView):
+    """
+    Several dashboard widgets in one response, e.g.
+    ?widgets=admin_summary,task_stats (default: all of dashboard.widgets.WIDGETS).
+    Counts shared between widgets are computed once.
+    """
+    permission_classes = [IsAuthenticated, IsAdminOrManager]
 
-        return Response({
-            "total_employees": total_employees,
-            **counts
-        })
+    @cached_response(scope='role')
+    def get(self, request):
+        return Response(build_widgets(parse_widgets(request.query_params)))
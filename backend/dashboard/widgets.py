@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Q
+from django.utils.timezone import now
+from rest_framework.exceptions import ValidationError
+from tasks.models import Task, TaskGroup
+
+User = get_user_model()
+
+ACTIVE = Q(status__in=['todo', 'in_progress'])
+
+
+def task_counts(today):
+    return {
+        'total_tasks': Count('id'),
+        'active_tasks': Count('id', filter=ACTIVE),
+        'completed_tasks': Count('id', filter=Q(status='completed')),
+        'overdue_tasks': Count('id', filter=ACTIVE & Q(due_date__lt=today)),
+    }
+
+
+USER_COUNTS = {
+    'total_employees': Count('id', filter=Q(role='employee')),
+    'employees_and_clients': Count('id', filter=Q(role__in=['employee', 'client'])),
+    'total_managers': Count('id', filter=Q(role='manager')),
+}
+
+# widget -> {response key: count it shows}
+WIDGETS = {
+    'admin_summary': {
+        'total_employees': 'employees_and_clients',
+        'total_managers': 'total_managers',
+        'total_tasks': 'total_tasks',
+        'total_projects': 'total_projects',
+        'completed_tasks': 'completed_tasks',
+        'active_tasks': 'active_tasks',
+    },
+    'analytics_simple': {
+        'total_employees': 'total_employees',
+        'total_tasks': 'total_tasks',
+        'active_tasks': 'active_tasks',
+        'completed_tasks': 'completed_tasks',
+        'overdue_tasks': 'overdue_tasks',
+    },
+    'total_employees': {
+        'total_employees': 'total_employees',
+    },
+    'task_stats': {
+        'total_tasks': 'total_tasks',
+        'active_tasks_count': 'active_tasks',
+        'overdue_tasks_count': 'overdue_tasks',
+        'completed_tasks_count': 'completed_tasks',
+    },
+}
+
+
+def parse_widgets(params):
+    names = params.get('widgets')
+    names = list(dict.fromkeys(names.split(','))) if names else list(WIDGETS)
+    unknown = set(names) - set(WIDGETS)
+    if unknown:
+        raise ValidationError({"widgets": f"Must be any of {', '.join(WIDGETS)}"})
+    return names
+
+
+def counts_for(needed):
+    """
+    The named counts, with at most one conditional aggregate over tasks, one
+    over users and one COUNT of groups, each only when something needs it.
+    """
+    tasks = {name: expr for name, expr in task_counts(now().date()).items() if name in needed}
+    users = {name: expr for name, expr in USER_COUNTS.items() if name in needed}
+    counts = {}
+    if tasks:
+        counts.update(Task.objects.aggregate(**tasks))
+    if users:
+        counts.update(User.objects.aggregate(**users))
+    if 'total_projects' in needed:
+        counts['total_projects'] = TaskGroup.objects.count()
+    return counts
+
+
+def build_widgets(names):
+    counts = counts_for({count for name in names for count in WIDGETS[name].values()})
+    return {
+        name: {key: counts[count] for key, count in WIDGETS[name].items()}
+        for name in names
+    }
+
+
+def build_widget(name):
+    return build_widgets([name])[name]
@@ -0,0 +1,56 @@
+from django.db.models import Count, Exists, Q
+from django.utils.timezone import now
+from tasks.models import Task
+from tasks.visibility import assigned_tasks, assignment
+
+PENDING = Q(status__in=['todo', 'in_progress'])
+STATUSES = [value for value, _ in Task.STATUS_CHOICES]
+
+
+def task_summary(user):
+    """
+    Overview counts and the per-status breakdown of the user's tasks from a
+    single conditional aggregate.
+    """
+    today = now().date()
+    counts = assigned_tasks(user).aggregate(
+        total_tasks=Count('id'),
+        pending_tasks=Count('id', filter=PENDING),
+        overdue_tasks=Count('id', filter=PENDING & Q(due_date__lt=today)),
+        **{status: Count('id', filter=Q(status=status)) for status in STATUSES}
+    )
+    overview = {
+        "total_tasks": counts['total_tasks'],
+        "completed_tasks": counts['completed'],
+        "pending_tasks": counts['pending_tasks'],
+        "overdue_tasks": counts['overdue_tasks'],
+    }
+    breakdown = [
+        {"status": status, "count": counts[status]} for status in STATUSES if counts[status]
+    ]
+    return overview, breakdown
+
+
+def group_stats(user):
+    """My and total task counts for every group the user has a task in, in one query."""
+    rows = Task.objects.filter(
+        group__in=assigned_tasks(user).filter(group__isnull=False).values('group')
+    ).values('group__name').annotate(
+        my_tasks=Count('id', filter=Exists(assignment(user))),
+        total_tasks=Count('id')
+    ).order_by('group__name')
+    return [
+        {
+            "group_name": row['group__name'],
+            "my_tasks": row['my_tasks'],
+            "total_tasks": row['total_tasks']
+        } for row in rows
+    ]
+
+
+def recent_tasks(user, limit=5):
+    # Joined from the (user_id, task_id) assignment index, so only the
+    # user's own tasks are sorted
+    return list(Task.objects.filter(assigned_to=user).order_by('-created_at', '-id')[:limit].values(
+        'title', 'status', 'due_date'
+    ))
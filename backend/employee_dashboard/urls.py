@@ -1,5 +1,6 @@
 from django.urls import path
 from .views import (
+    EmployeeHomeView,
     EmployeeTaskOverviewView,
     EmployeeTaskStatusView,
     EmployeeGroupStatsView,
@@ -8,6 +9,7 @@ from .views import (
 )
 
 urlpatterns = [
+    path('home/', EmployeeHomeView.as_view()),
     path('task-overview/', EmployeeTaskOverviewView.as_view()),
     path('task-status/', EmployeeTaskStatusView.as_view()),
     path('group-info/', EmployeeGroupStatsView.as_view()),
@@ -1,115 +1,71 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.utils.timezone import now
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from django.db.models import Count
-from tasks.models import Task
+from dashboard.cache import cached_response
+from tasks.transitions import TransitionConflict, etag, expected_version, transition_status
+from tasks.visibility import assigned_tasks
 from .serializers import EmployeeTaskSubmitSerializer
+from .summary import group_stats, recent_tasks, task_summary
 
-class EmployeeTaskOverviewView(APIView):
+class EmployeeHomeView(APIView):
+    """Overview, status breakdown, groups and recent tasks in one response."""
     permission_classes = [IsAuthenticated]
 
+    @cached_response(scope='user')
     def get(self, request):
         user = request.user
-        today = now().date()
-
-        tasks = Task.objects.filter(assigned_to=user)
+        overview, breakdown = task_summary(user)
 
         return Response({
-            "total_tasks": tasks.count(),
-            "completed_tasks": tasks.filter(status='completed').count(),
-            "pending_tasks": tasks.filter(status__in=['todo', 'in_progress']).count(),
-            "overdue_tasks": tasks.filter(
-                status__in=['todo', 'in_progress'],
-                due_date__lt=today
-            ).count()
+            "overview": overview,
+            "task_status_breakdown": breakdown,
+            "groups": group_stats(user),
+            "recent_tasks": recent_tasks(user)
         })
 
-class EmployeeTaskStatusView(APIView):
+class EmployeeTaskOverviewView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @cached_response(scope='user')
     def get(self, request):
-        user = request.user
+        overview, _ = task_summary(request.user)
+        return Response(overview)
 
-        status_data = Task.objects.filter(
-            assigned_to=user
-        ).values('status').annotate(
-            count=Count('id')
-        )
+class EmployeeTaskStatusView(APIView):
+    permission_classes = [IsAuthenticated]
 
+    @cached_response(scope='user')
+    def get(self, request):
+        _, breakdown = task_summary(request.user)
         return Response({
-            "task_status_breakdown": list(status_data)
+            "task_status_breakdown": breakdown
         })
 
 class EmployeeGroupStatsView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @cached_response(scope='user')
     def get(self, request):
-        user = request.user
-
-        my_tasks = Task.objects.filter(
-            assigned_to=user,
-            group__isnull=False
-        )
-
-        my_group_tasks = my_tasks.values(
-            'group__name'
-        ).annotate(
-            my_tasks=Count('id')
-        )
-
-        group_totals = Task.objects.filter(
-            group__in=my_tasks.values('group')
-        ).values(
-            'group__name'
-        ).annotate(
-            total_tasks=Count('id')
-        )
-
-        result = []
-        for g in my_group_tasks:
-            total = next(
-                (t['total_tasks'] for t in group_totals
-                 if t['group__name'] == g['group__name']),
-                0
-            )
-            result.append({
-                "group_name": g['group__name'],
-                "my_tasks": g['my_tasks'],
-                "total_tasks": total
-            })
-
         return Response({
-            "groups": result
+            "groups": group_stats(request.user)
         })
 
 class EmployeeRecentTasksView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @cached_response(scope='user')
     def get(self, request):
-        user = request.user
-
-        recent_tasks = Task.objects.filter(
-            assigned_to=user
-        ).order_by('-created_at')[:5].values(
-            'title', 'status', 'due_date'
-        )
-
         return Response({
-            "recent_tasks": list(recent_tasks)
+            "recent_tasks": recent_tasks(request.user)
         })
 
 class EmployeeTaskSubmitView(APIView):
     permission_classes = [IsAuthenticated]
 
     def patch(self, request, task_id):
-        task = get_object_or_404(
-            Task,
-            id=task_id,
-            assigned_to=request.user
-        )
+        task = get_object_or_404(assigned_tasks(request.user), id=task_id)
 
         serializer = EmployeeTaskSubmitSerializer(
             task,
@@ -118,12 +74,25 @@ class EmployeeTaskSubmitView(APIView):
         )
         serializer.is_valid(raise_exception=True)
 
-        serializer.save()
+        try:
+            transition_status(
+                task,
+                serializer.validated_data.get('status', task.status),
+                version=expected_version(request),
+                actor=request.user
+            )
+        except TransitionConflict:
+            return Response(
+                {"error": "Task was changed by someone else, reload it and retry"},
+                status=status.HTTP_409_CONFLICT
+            )
 
-        return Response(
+        response = Response(
             {
                 "message": "Task updated successfully",
-                "task": serializer.data
+                "task": EmployeeTaskSubmitSerializer(task).data
             },
             status=status.HTTP_200_OK
-        )
\ No newline at end of file
+        )
+        response['ETag'] = etag(task)
+        return response
@@ -0,0 +1,28 @@
+import time
+from django.core.management.base import BaseCommand
+from jobs.worker import run_workers
+
+class Command(BaseCommand):
+    help = 'Run background job worker threads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=2, help='Number of worker threads')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to wait when the queue is empty')
+        parser.add_argument('--drain', action='store_true',
+                            help='Exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Starting {options['threads']} worker thread(s)...")
+        started = time.monotonic()
+        workers = run_workers(
+            threads=options['threads'],
+            poll_interval=options['poll_interval'],
+            drain=options['drain'],
+        )
+        elapsed = time.monotonic() - started
+        processed = sum(worker.processed for worker in workers)
+        failed = sum(worker.failed for worker in workers)
+        self.stdout.write(self.style.SUCCESS(
+            f'Workers stopped: {processed} jobs done, {failed} failed in {elapsed:.2f}s.'
+        ))
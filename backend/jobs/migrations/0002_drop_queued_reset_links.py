@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def drop_queued_reset_links(apps, schema_editor):
+    # Password reset jobs used to carry the reset link, token included, in
+    # their payload; they now only carry the user id
+    Job = apps.get_model('jobs', 'Job')
+    stale = [
+        job.id for job in Job.objects.filter(name='users.send_password_reset').only('id', 'payload')
+        if 'reset_link' in job.payload
+    ]
+    Job.objects.filter(id__in=stale).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_queued_reset_links, migrations.RunPython.noop),
+    ]
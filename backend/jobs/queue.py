@@ -0,0 +1,120 @@
+import logging
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+MAX_BACKOFF = timedelta(hours=1)
+
+
+def register(name):
+    """Register a function as the handler for jobs enqueued under `name`."""
+    def decorator(func):
+        registry[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, run_at=None, max_attempts=None, **payload):
+    """
+    Queue a job for the worker. The row is written in the caller's
+    transaction, so the job only becomes visible once that commits. With
+    JOBS_EAGER the handler instead runs in-process right after the commit.
+    """
+    if name not in registry:
+        raise LookupError(f"No job registered as '{name}'")
+
+    if settings.JOBS_EAGER:
+        transaction.on_commit(lambda: run_eager(name, payload))
+        return None
+
+    return Job.objects.create(
+        name=name,
+        payload=payload,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
+
+
+def run_eager(name, payload):
+    # The request's own write has already committed, so a failing handler
+    # is logged like a worker failure instead of turning it into a 500
+    try:
+        with transaction.atomic():
+            registry[name](**payload)
+    except Exception:
+        logger.exception("Job %s failed when run eagerly", name)
+
+
+def claimable(now):
+    """
+    Queued jobs that are due, and running jobs whose worker has held them
+    longer than JOBS_LOCK_TIMEOUT (it most likely died mid-run).
+    """
+    stale = now - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT)
+    return Q(status='queued', run_at__lte=now) | Q(status='running', locked_at__lt=stale)
+
+
+def claim(worker_id, limit=1):
+    """
+    Claim up to `limit` due or stale jobs for `worker_id`. Uses SKIP LOCKED
+    where the database supports it; elsewhere (SQLite) each row is claimed
+    with a conditional UPDATE so two workers can never take the same job.
+    """
+    now = timezone.now()
+    condition = claimable(now)
+    due = Job.objects.filter(condition).order_by('run_at', 'id')
+    claim_fields = dict(status='running', locked_by=worker_id, locked_at=now, attempts=F('attempts') + 1)
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list('id', flat=True)[:limit])
+            Job.objects.filter(id__in=ids).update(**claim_fields)
+    else:
+        ids = []
+        for job_id in due.values_list('id', flat=True)[:limit * 4]:
+            if Job.objects.filter(condition, id=job_id).update(**claim_fields):
+                ids.append(job_id)
+                if len(ids) == limit:
+                    break
+
+    return list(Job.objects.filter(id__in=ids).order_by('run_at', 'id'))
+
+
+def backoff(attempts):
+    delay = timedelta(seconds=settings.JOBS_RETRY_BACKOFF * 2 ** (attempts - 1))
+    return min(delay, MAX_BACKOFF)
+
+
+def run_job(job):
+    """Run a claimed job in one transaction; finished jobs are deleted, failures are retried with backoff."""
+    handler = registry.get(job.name)
+    try:
+        if handler is None:
+            raise LookupError(f"No job registered as '{job.name}'")
+        # The handler's writes and the job's removal commit together, so a
+        # failed attempt leaves nothing behind for its retry to duplicate
+        with transaction.atomic():
+            handler(**job.payload)
+            Job.objects.filter(id=job.id).delete()
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("Job %s (%s) failed on attempt %s", job.id, job.name, job.attempts)
+        if job.attempts >= job.max_attempts:
+            Job.objects.filter(id=job.id).update(status='failed', last_error=error, locked_by='')
+        else:
+            Job.objects.filter(id=job.id).update(
+                status='queued',
+                run_at=timezone.now() + backoff(job.attempts),
+                last_error=error,
+                locked_by=''
+            )
+        return False
+    return True
@@ -0,0 +1,104 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from .models import Job
+from .queue import claim, enqueue, register, run_job
+
+calls = []
+
+
+@register('jobs.tests.record')
+def record(value):
+    calls.append(value)
+
+
+@override_settings(JOBS_EAGER=False, JOBS_LOCK_TIMEOUT=600)
+class ClaimTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_a_job_is_claimed_by_one_worker_only(self):
+        job = enqueue('jobs.tests.record', value=1)
+
+        first = claim('worker-1', limit=5)
+        second = claim('worker-2', limit=5)
+
+        self.assertEqual([j.id for j in first], [job.id])
+        self.assertEqual(second, [])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, job.attempts), ('running', 'worker-1', 1))
+
+    def test_jobs_not_yet_due_are_left_queued(self):
+        enqueue('jobs.tests.record', run_at=timezone.now() + timedelta(minutes=5), value=1)
+        self.assertEqual(claim('worker-1'), [])
+
+    def test_a_stale_running_job_is_claimed_again(self):
+        job = enqueue('jobs.tests.record', value=1)
+        claim('worker-1')
+        self.assertEqual(claim('worker-2'), [])
+
+        Job.objects.filter(id=job.id).update(locked_at=timezone.now() - timedelta(seconds=601))
+        reclaimed = claim('worker-2')
+
+        self.assertEqual([j.id for j in reclaimed], [job.id])
+        self.assertEqual((reclaimed[0].locked_by, reclaimed[0].attempts), ('worker-2', 2))
+
+    def test_a_finished_job_is_deleted(self):
+        enqueue('jobs.tests.record', value=7)
+        for job in claim('worker-1'):
+            self.assertTrue(run_job(job))
+        self.assertEqual(calls, [7])
+        self.assertFalse(Job.objects.exists())
+
+
+@register('jobs.tests.fail_after_write')
+def fail_after_write(marker):
+    Job.objects.create(name=marker)
+    raise RuntimeError("failed part way")
+
+
+@override_settings(JOBS_EAGER=False, JOBS_RETRY_BACKOFF=10)
+class RunJobTests(TestCase):
+    def test_a_failed_attempt_rolls_back_its_writes_and_is_retried(self):
+        job = enqueue('jobs.tests.fail_after_write', marker='partial')
+        [claimed] = claim('worker-1')
+
+        self.assertFalse(run_job(claimed))
+
+        self.assertFalse(Job.objects.filter(name='partial').exists())
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'queued')
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn('failed part way', job.last_error)
+
+    def test_a_job_fails_for_good_after_its_last_attempt(self):
+        job = enqueue('jobs.tests.fail_after_write', max_attempts=1, marker='partial')
+        [claimed] = claim('worker-1')
+
+        self.assertFalse(run_job(claimed))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+
+
+@register('jobs.tests.fail')
+def fail():
+    raise RuntimeError("handler failed")
+
+
+@override_settings(JOBS_EAGER=True)
+class EagerJobTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_eager_jobs_run_after_the_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIsNone(enqueue('jobs.tests.record', value=3))
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, [3])
+        self.assertFalse(Job.objects.exists())
+
+    def test_eager_job_failures_are_logged_not_raised(self):
+        with self.assertLogs('jobs.queue', level='ERROR'):
+            with self.captureOnCommitCallbacks(execute=True):
+                enqueue('jobs.tests.fail')
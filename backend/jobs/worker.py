@@ -0,0 +1,51 @@
+import os
+import socket
+import threading
+from django.db import close_old_connections, connection
+from .queue import claim, run_job
+
+
+class Worker(threading.Thread):
+    def __init__(self, index, stop_event, poll_interval=1.0, drain=False):
+        super().__init__(name=f"{socket.gethostname()}:{os.getpid()}:{index}", daemon=True)
+        self.stop_event = stop_event
+        self.poll_interval = poll_interval
+        # Exit once the queue is empty instead of polling forever
+        self.drain = drain
+        self.processed = 0
+        self.failed = 0
+
+    def run(self):
+        try:
+            while not self.stop_event.is_set():
+                close_old_connections()
+                jobs = claim(self.name)
+                if not jobs:
+                    if self.drain:
+                        break
+                    self.stop_event.wait(self.poll_interval)
+                    continue
+                for job in jobs:
+                    if run_job(job):
+                        self.processed += 1
+                    else:
+                        self.failed += 1
+        finally:
+            connection.close()
+
+
+def run_workers(threads=1, poll_interval=1.0, drain=False, stop_event=None):
+    stop_event = stop_event or threading.Event()
+
+    workers = [Worker(i, stop_event, poll_interval, drain) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    try:
+        while any(worker.is_alive() for worker in workers):
+            for worker in workers:
+                worker.join(timeout=0.5)
+    except KeyboardInterrupt:
+        stop_event.set()
+        for worker in workers:
+            worker.join()
+    return workers
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from .models import Notification
+from .serializers import NotificationSerializer
+
+logger = logging.getLogger(__name__)
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = import_string(settings.NOTIFICATION_BROKER)()
+    return _broker
+
+
+class BaseBroker:
+    """
+    Pub/sub interface used by the notification stream. `publish` is called
+    from synchronous code once notifications are written; `subscribe`
+    returns a subscription whose `get(timeout)` coroutine yields the next
+    message or None on timeout, and whose `close()` must be called when the
+    stream ends. A Redis-backed broker only needs to provide the same two
+    methods.
+    """
+
+    def publish(self, user_id, message):
+        raise NotImplementedError
+
+    def subscribe(self, user_id):
+        raise NotImplementedError
+
+
+class InMemorySubscription:
+    def __init__(self, broker, user_id, maxsize):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A stalled client catches up through Last-Event-ID on reconnect
+            pass
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InMemoryBroker(BaseBroker):
+    """
+    In-process broker. Only connections served by the same process see a
+    publish, so it only suits a single process that both writes the
+    notifications (JOBS_EAGER) and serves the stream.
+    """
+    maxsize = 100
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = {}
+
+    def publish(self, user_id, message):
+        self.deliver(user_id, message)
+
+    def deliver(self, user_id, message):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+            except RuntimeError:
+                # The subscriber's event loop has already shut down
+                subscription.close()
+
+    def subscribe(self, user_id):
+        subscription = InMemorySubscription(self, user_id, self.maxsize)
+        with self.lock:
+            self.subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscriptions[subscription.user_id]
+
+
+class DatabaseBroker(InMemoryBroker):
+    """
+    Broker backed by the notifications table itself, so notifications
+    written by any process, including the job worker, reach every web
+    process without a shared message bus. One poller thread per process
+    reads the rows of all its subscribed users every `interval` seconds and
+    hands them to their subscriptions: new rows by id, and rows a coalesced
+    update bumped (count > 1, created_at moved forward) within `overlap`.
+    `publish` has nothing to do.
+    """
+    overlap = timedelta(seconds=30)
+    batch_size = 500
+
+    def __init__(self):
+        super().__init__()
+        self.interval = settings.NOTIFICATION_STREAM_POLL_INTERVAL
+        self.poller = None
+        self.last_id = None
+        self.since = None
+        self.delivered = {}
+
+    def publish(self, user_id, message):
+        pass
+
+    def subscribe(self, user_id):
+        subscription = super().subscribe(user_id)
+        with self.lock:
+            if self.poller is None:
+                # Rows from before the first subscription are not streamed
+                self.last_id, self.since, self.delivered = None, timezone.now(), {}
+                self.poller = self.start_poller()
+        return subscription
+
+    def start_poller(self):
+        poller = threading.Thread(target=self.run, name='notification-poller', daemon=True)
+        poller.start()
+        return poller
+
+    def run(self):
+        """Poll until the last subscription closes, on its own connection."""
+        try:
+            while True:
+                time.sleep(self.interval)
+                with self.lock:
+                    if not self.subscriptions:
+                        self.poller = None
+                        return
+                try:
+                    self.poll()
+                except DatabaseError:
+                    logger.exception("Polling for notifications failed")
+                    # Reconnect on the next poll
+                    connection.close()
+        finally:
+            connection.close()
+
+    def poll(self):
+        with self.lock:
+            user_ids = list(self.subscriptions)
+        if not user_ids:
+            return
+        started = timezone.now()
+        rows = Notification.objects.filter(user_id__in=user_ids)
+
+        # New rows; the id cursor only moves past rows actually read
+        while True:
+            if self.last_id is None:
+                batch = rows.filter(created_at__gte=self.since)
+            else:
+                batch = rows.filter(id__gt=self.last_id)
+            batch = list(batch.order_by('id')[:self.batch_size])
+            if batch:
+                self.last_id = batch[-1].id
+            self.send(batch)
+            if len(batch) < self.batch_size:
+                break
+
+        if self.last_id is not None:
+            bumped = list(rows.filter(
+                id__lte=self.last_id, count__gt=1, created_at__gte=self.since
+            ).order_by('created_at', 'id')[:self.batch_size])
+            self.send(bumped)
+            # Same for the window: a truncated read resumes from its last row
+            if len(bumped) == self.batch_size:
+                self.since = bumped[-1].created_at
+            else:
+                self.since = max(self.since, started - self.overlap)
+        self.delivered = {pk: at for pk, at in self.delivered.items() if at >= self.since}
+
+    def send(self, notifications):
+        for notification in notifications:
+            if self.delivered.get(notification.id) != notification.created_at:
+                self.delivered[notification.id] = notification.created_at
+                self.deliver(notification.user_id, NotificationSerializer(notification).data)
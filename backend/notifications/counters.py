@@ -0,0 +1,53 @@
+from collections import Counter
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from .models import Notification, UnreadNotificationCounter
+
+
+def ensure_counters(user_ids):
+    UnreadNotificationCounter.objects.bulk_create(
+        [UnreadNotificationCounter(user_id=user_id) for user_id in user_ids],
+        ignore_conflicts=True
+    )
+
+
+def increment_unread(notifications):
+    """Add newly created unread notifications to their users' counters."""
+    per_user = Counter(n.user_id for n in notifications if not n.is_read)
+    if not per_user:
+        return
+    ensure_counters(per_user)
+
+    # One UPDATE per distinct increment, usually just +1 for everyone
+    by_amount = {}
+    for user_id, amount in per_user.items():
+        by_amount.setdefault(amount, []).append(user_id)
+    for amount, user_ids in by_amount.items():
+        UnreadNotificationCounter.objects.filter(user_id__in=user_ids).update(count=F('count') + amount)
+
+
+def decrement_unread(user_id, amount):
+    if amount:
+        UnreadNotificationCounter.objects.filter(user_id=user_id).update(
+            count=Greatest(F('count') - amount, Value(0))
+        )
+
+
+def recount_unread(user_ids=None):
+    """Recompute counters from the notifications table, for all users or the given ones."""
+    unread = Notification.objects.filter(
+        user=OuterRef('user'), is_read=False
+    ).order_by().values('user').annotate(total=Count('id')).values('total')
+
+    counters = UnreadNotificationCounter.objects.all()
+    if user_ids is None:
+        user_ids = Notification.objects.filter(is_read=False).values_list('user_id', flat=True).distinct()
+    else:
+        counters = counters.filter(user_id__in=user_ids)
+    ensure_counters(list(user_ids))
+    return counters.update(count=Coalesce(Subquery(unread), Value(0)))
+
+
+def unread_count(user_id):
+    count = UnreadNotificationCounter.objects.filter(user_id=user_id).values_list('count', flat=True).first()
+    return count or 0
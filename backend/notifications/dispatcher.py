@@ -0,0 +1,105 @@
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .broker import get_broker
+from .counters import increment_unread
+from .models import Notification
+from .serializers import NotificationSerializer
+
+User = get_user_model()
+
+# Notification types that repeat on every save and can be merged
+COALESCE_TYPES = ['task_updated', 'admin_task_updated']
+
+
+def admin_ids():
+    return list(User.objects.filter(role='admin').values_list('id', flat=True))
+
+
+def publish_notifications(notifications):
+    broker = get_broker()
+    for notification in notifications:
+        broker.publish(notification.user_id, NotificationSerializer(notification).data)
+
+
+class NotificationDispatcher:
+    """
+    Collects every recipient of a single task event and writes them with
+    one bulk_create in the caller's transaction (the job's, so a retried
+    job never writes them twice); they are published once it commits.
+    """
+
+    def __init__(self, task=None):
+        self.task = task
+        self.pending = []
+
+    def add(self, user_ids, title, message, notif_type):
+        for user_id in user_ids:
+            self.pending.append(Notification(
+                user_id=user_id,
+                task=self.task,
+                title=title,
+                message=message,
+                notif_type=notif_type,
+            ))
+
+    def dispatch(self):
+        notifications, self.pending = self.pending, []
+        if notifications:
+            self.write(notifications)
+
+    def write(self, notifications):
+        merged = []
+        with transaction.atomic():
+            window = settings.NOTIFICATION_COALESCE_WINDOW
+            if window and self.task is not None:
+                notifications, merged = self.coalesce(notifications, timedelta(seconds=window))
+            created = Notification.objects.bulk_create(notifications)
+            increment_unread(created)
+            if merged:
+                merged = list(Notification.objects.filter(id__in=merged))
+        transaction.on_commit(lambda: publish_notifications(created + merged))
+        return created
+
+    def coalesce(self, notifications, window):
+        """
+        Merge update notifications into an unread row for the same
+        (user, task, notif_type) last bumped within `window`, raising its
+        count, replacing its message and moving its created_at to now, so
+        the window slides and the row sorts as the newest in the inbox.
+        Returns the notifications still to insert and the merged row ids.
+        """
+        candidates = [n for n in notifications if n.notif_type in COALESCE_TYPES]
+        if not candidates:
+            return notifications, []
+
+        now = timezone.now()
+        recent = Notification.objects.filter(
+            task=self.task,
+            notif_type__in={n.notif_type for n in candidates},
+            user_id__in={n.user_id for n in candidates},
+            is_read=False,
+            created_at__gte=now - window
+        ).order_by('id').values_list('user_id', 'notif_type', 'id')
+        existing = {(user_id, notif_type): pk for user_id, notif_type, pk in recent}
+
+        merged = {}
+        remaining = []
+        for notification in notifications:
+            pk = existing.get((notification.user_id, notification.notif_type))
+            if pk is None or notification.notif_type not in COALESCE_TYPES:
+                remaining.append(notification)
+            else:
+                merged.setdefault((notification.title, notification.message), []).append(pk)
+
+        for (title, message), ids in merged.items():
+            Notification.objects.filter(id__in=ids).update(
+                count=F('count') + 1,
+                title=title,
+                message=message,
+                created_at=now
+            )
+        return remaining, [pk for ids in merged.values() for pk in ids]
@@ -0,0 +1,156 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from jobs.queue import register
+from tasks.models import Task
+from .dispatcher import NotificationDispatcher, admin_ids
+from .tasks import (
+    create_admin_overdue_notifications,
+    create_due_soon_notifications_for_employees,
+    create_manager_notifications,
+)
+
+User = get_user_model()
+
+
+def get_task(task_id):
+    # The task may have been deleted before the job ran
+    return Task.objects.select_related('created_by').filter(id=task_id).first()
+
+
+@register('notifications.task_assigned')
+def task_assigned(task_id, user_ids):
+    task = get_task(task_id)
+    if task is None:
+        return
+
+    dispatcher = NotificationDispatcher(task)
+    dispatcher.add(
+        user_ids,
+        title="Task Assigned",
+        message=f"You have been assigned to task '{task.title}'",
+        notif_type="task_assigned"
+    )
+    # Admins should also get notified for assignment
+    assigned_count = task.assigned_to.count()
+    dispatcher.add(
+        admin_ids(),
+        title="Task Assignment Update",
+        message=f"Task '{task.title}' assigned to {assigned_count} users",
+        notif_type="admin_task_created"
+    )
+    dispatcher.dispatch()
+
+
+@register('notifications.task_saved')
+def task_saved(task_id, created):
+    task = get_task(task_id)
+    if task is None:
+        return
+
+    dispatcher = NotificationDispatcher(task)
+    creator = task.created_by
+    creator_name = creator.username if creator else None
+
+    if created:
+        # Task created
+        if creator and creator.role == 'manager':
+            dispatcher.add(
+                [creator.id],
+                title="Task Created",
+                message=f"New task '{task.title}' created by you",
+                notif_type="task_assigned"
+            )
+        # Admin notification
+        dispatcher.add(
+            admin_ids(),
+            title="New Task Created",
+            message=f"New task '{task.title}' created by {creator_name}",
+            notif_type="admin_task_created"
+        )
+    else:
+        # Task updated
+        dispatcher.add(
+            task.assigned_to.filter(role='employee').values_list('id', flat=True),
+            title="Task Updated",
+            message=f"Task '{task.title}' has been updated",
+            notif_type="task_updated"
+        )
+        # Manager who created the task
+        if creator and creator.role == 'manager':
+            dispatcher.add(
+                [creator.id],
+                title="Task Activity",
+                message=f"Task '{task.title}' updated",
+                notif_type="task_updated"
+            )
+        # Admin notification
+        dispatcher.add(
+            admin_ids(),
+            title="Task Update",
+            message=f"Task '{task.title}' updated by {creator_name}",
+            notif_type="admin_task_updated"
+        )
+
+    dispatcher.dispatch()
+
+
+@register('notifications.tasks_batch')
+def tasks_batch(created_ids, updated_ids, assignments, actor_id):
+    # One aggregated notification per recipient for the whole batch
+    dispatcher = NotificationDispatcher()
+    actor_name = User.objects.filter(id=actor_id).values_list('username', flat=True).first()
+
+    assigned_counts = {}
+    for _, user_id in assignments:
+        assigned_counts[user_id] = assigned_counts.get(user_id, 0) + 1
+    for user_id, count in assigned_counts.items():
+        dispatcher.add(
+            [user_id],
+            title="Tasks Assigned",
+            message=f"You have been assigned {count} new task(s)",
+            notif_type="task_assigned"
+        )
+
+    if updated_ids:
+        updated_counts = Task.assigned_to.through.objects.filter(
+            task_id__in=updated_ids, user__role='employee'
+        ).values('user_id').annotate(count=Count('task_id'))
+        for row in updated_counts:
+            dispatcher.add(
+                [row['user_id']],
+                title="Tasks Updated",
+                message=f"{row['count']} of your tasks have been updated",
+                notif_type="task_updated"
+            )
+
+    admins = admin_ids()
+    if created_ids:
+        dispatcher.add(
+            admins,
+            title="New Tasks Created",
+            message=f"{len(created_ids)} new tasks created by {actor_name}",
+            notif_type="admin_task_created"
+        )
+    if updated_ids:
+        dispatcher.add(
+            admins,
+            title="Tasks Update",
+            message=f"{len(updated_ids)} tasks updated by {actor_name}",
+            notif_type="admin_task_updated"
+        )
+    dispatcher.dispatch()
+
+
+@register('notifications.due_soon_sweep')
+def due_soon_sweep():
+    create_due_soon_notifications_for_employees()
+
+
+@register('notifications.manager_overdue_sweep')
+def manager_overdue_sweep():
+    create_manager_notifications()
+
+
+@register('notifications.admin_overdue_sweep')
+def admin_overdue_sweep():
+    create_admin_overdue_notifications()
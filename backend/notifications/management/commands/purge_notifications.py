@@ -0,0 +1,36 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from notifications.retention import purge_expired_notifications
+
+class Command(BaseCommand):
+    help = 'Delete or archive notifications older than NOTIFICATION_RETENTION_DAYS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Notifications handled per transaction')
+        parser.add_argument('--archive', action='store_true', default=settings.NOTIFICATION_ARCHIVE,
+                            help='Copy rows into ArchivedNotification before deleting them')
+        parser.add_argument('--no-archive', action='store_false', dest='archive')
+        parser.add_argument('--include-unread', action='store_true',
+                            help='Also purge expired notifications that were never read')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only count the notifications that would be removed')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        removed = purge_expired_notifications(
+            chunk_size=options['chunk_size'],
+            archive=options['archive'],
+            include_unread=options['include_unread'],
+            dry_run=options['dry_run'],
+        )
+        elapsed = time.monotonic() - started
+
+        if options['dry_run']:
+            self.stdout.write(f'{removed} notifications would be removed.')
+            return
+        action = 'archived' if options['archive'] else 'deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f'Notifications {action}: {removed} removed in {elapsed:.2f}s.'
+        ))
@@ -0,0 +1,24 @@
+import time
+from django.core.management.base import BaseCommand
+from jobs.queue import enqueue
+from notifications.tasks import create_admin_overdue_notifications
+
+class Command(BaseCommand):
+    help = 'Send overdue task notifications for admins'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--enqueue', action='store_true',
+                            help='Queue the sweep for the job worker instead of running it here')
+
+    def handle(self, *args, **kwargs):
+        if kwargs['enqueue']:
+            enqueue('notifications.admin_overdue_sweep')
+            self.stdout.write(self.style.SUCCESS('Sweep queued.'))
+            return
+
+        started = time.monotonic()
+        written = create_admin_overdue_notifications()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Admin overdue notifications sent: {written} created in {elapsed:.2f}s.'
+        ))
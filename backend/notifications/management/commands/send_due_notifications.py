@@ -1,9 +1,24 @@
+import time
 from django.core.management.base import BaseCommand
+from jobs.queue import enqueue
 from notifications.tasks import create_due_soon_notifications_for_employees
 
 class Command(BaseCommand):
     help = 'Send due soon notifications for employees'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--enqueue', action='store_true',
+                            help='Queue the sweep for the job worker instead of running it here')
+
     def handle(self, *args, **kwargs):
-        create_due_soon_notifications_for_employees()
-        self.stdout.write(self.style.SUCCESS('Employee due soon notifications sent.'))
+        if kwargs['enqueue']:
+            enqueue('notifications.due_soon_sweep')
+            self.stdout.write(self.style.SUCCESS('Sweep queued.'))
+            return
+
+        started = time.monotonic()
+        written = create_due_soon_notifications_for_employees()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Employee due soon notifications sent: {written} created in {elapsed:.2f}s.'
+        ))
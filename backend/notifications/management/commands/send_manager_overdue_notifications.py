@@ -0,0 +1,24 @@
+import time
+from django.core.management.base import BaseCommand
+from jobs.queue import enqueue
+from notifications.tasks import create_manager_notifications
+
+class Command(BaseCommand):
+    help = 'Send overdue task notifications for managers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--enqueue', action='store_true',
+                            help='Queue the sweep for the job worker instead of running it here')
+
+    def handle(self, *args, **kwargs):
+        if kwargs['enqueue']:
+            enqueue('notifications.manager_overdue_sweep')
+            self.stdout.write(self.style.SUCCESS('Sweep queued.'))
+            return
+
+        started = time.monotonic()
+        written = create_manager_notifications()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Manager overdue notifications sent: {written} created in {elapsed:.2f}s.'
+        ))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:42
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+
+SWEEP_TYPES = ['task_due', 'manager_task_overdue', 'admin_task_overdue']
+
+
+def remove_duplicate_sweep_notifications(apps, schema_editor):
+    Notification = apps.get_model('notifications', 'Notification')
+    sweep = Notification.objects.filter(notif_type__in=SWEEP_TYPES)
+    keep = sweep.values('user', 'task', 'notif_type').annotate(keep_id=Min('id')).values('keep_id')
+    sweep.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_notification_title_alter_notification_notif_type'),
+        ('tasks', '0005_taskgroup_description'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_sweep_notifications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('notif_type__in', ['task_due', 'manager_task_overdue', 'admin_task_overdue'])), fields=('user', 'task', 'notif_type'), name='unique_sweep_notification'),
+        ),
+    ]
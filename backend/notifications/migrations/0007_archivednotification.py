@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0006_notification_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True)),
+                ('user_id', models.IntegerField(db_index=True)),
+                ('task_id', models.IntegerField(blank=True, null=True)),
+                ('title', models.CharField(max_length=255)),
+                ('message', models.TextField()),
+                ('notif_type', models.CharField(choices=[('task_assigned', 'Task Assigned'), ('task_updated', 'Task Updated'), ('task_due', 'Task Due Soon'), ('task_completed', 'Task Completed'), ('admin_task_created', 'Admin Task Created'), ('admin_task_updated', 'Admin Task Updated'), ('manager_task_overdue', 'Manager Task Overdue'), ('admin_task_overdue', 'Admin Task Overdue')], max_length=50)),
+                ('is_read', models.BooleanField(default=False)),
+                ('count', models.PositiveIntegerField(default=1)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_unread_counters(apps, schema_editor):
+    Notification = apps.get_model('notifications', 'Notification')
+    UnreadNotificationCounter = apps.get_model('notifications', 'UnreadNotificationCounter')
+    unread = Notification.objects.filter(is_read=False).values('user_id').annotate(total=Count('id'))
+    UnreadNotificationCounter.objects.bulk_create(
+        [UnreadNotificationCounter(user_id=row['user_id'], count=row['total']) for row in unread],
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0007_archivednotification'),
+        ('users', '0006_alter_user_phone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnreadNotificationCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='unread_notification_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_unread_counters, migrations.RunPython.noop),
+    ]
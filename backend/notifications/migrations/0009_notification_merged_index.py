@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0008_unreadnotificationcounter'),
+        ('tasks', '0010_task_completed_at_status_log'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('count__gt', 1)), fields=['created_at'], name='notif_merged_created_idx'),
+        ),
+    ]
@@ -4,6 +4,9 @@ from tasks.models import Task
 
 User = get_user_model()
 
+# Types written by the periodic sweeps: at most one per (user, task)
+SWEEP_TYPES = ['task_due', 'manager_task_overdue', 'admin_task_overdue']
+
 class Notification(models.Model):
     NOTIF_TYPES = [
         ('task_assigned', 'Task Assigned'),
@@ -15,14 +18,57 @@ class Notification(models.Model):
         ('manager_task_overdue', 'Manager Task Overdue'),
         ('admin_task_overdue', 'Admin Task Overdue'),
     ]
-
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
     task = models.ForeignKey(Task, on_delete=models.CASCADE, null=True, blank=True)
     title = models.CharField(max_length=255, default='Notification')
     message = models.TextField()
     notif_type = models.CharField(max_length=50, choices=NOTIF_TYPES)
     is_read = models.BooleanField(default=False)
+    # Number of task updates merged into this row by the coalescing window
+    count = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'is_read', 'created_at'], name='notif_user_read_created_idx'),
+            # Coalesced rows, read by DatabaseBroker's poller by created_at
+            models.Index(fields=['created_at'], condition=models.Q(count__gt=1), name='notif_merged_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'task', 'notif_type'],
+                condition=models.Q(notif_type__in=SWEEP_TYPES),
+                name='unique_sweep_notification',
+            ),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.notif_type}"
+
+
+class UnreadNotificationCounter(models.Model):
+    # Denormalized number of unread notifications per user, kept in step by
+    # notifications.counters so the inbox badge is a primary-key lookup
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='unread_notification_counter')
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id} - {self.count} unread"
+
+
+class ArchivedNotification(models.Model):
+    # Plain ids rather than foreign keys so archived rows never take part in
+    # user or task cascade deletes
+    original_id = models.BigIntegerField(unique=True)
+    user_id = models.IntegerField(db_index=True)
+    task_id = models.IntegerField(null=True, blank=True)
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    notif_type = models.CharField(max_length=50, choices=Notification.NOTIF_TYPES)
+    is_read = models.BooleanField(default=False)
+    count = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.user_id} - {self.notif_type} (archived)"
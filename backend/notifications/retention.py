@@ -0,0 +1,72 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .counters import recount_unread
+from .models import ArchivedNotification, Notification
+
+ARCHIVE_FIELDS = ['id', 'user_id', 'task_id', 'title', 'message', 'notif_type', 'is_read', 'count', 'created_at']
+
+
+def expired_notifications(include_unread=False, now=None):
+    """Notifications older than the retention limit for their notif_type."""
+    now = now or timezone.now()
+    policy = dict(settings.NOTIFICATION_RETENTION_DAYS)
+    default_days = policy.pop('default', None)
+
+    expired = Q()
+    for notif_type, days in policy.items():
+        expired |= Q(notif_type=notif_type, created_at__lt=now - timedelta(days=days))
+    if default_days is not None:
+        expired |= Q(created_at__lt=now - timedelta(days=default_days)) & ~Q(notif_type__in=list(policy))
+
+    if not expired:
+        return Notification.objects.none()
+
+    notifications = Notification.objects.filter(expired)
+    if not include_unread:
+        notifications = notifications.filter(is_read=True)
+    return notifications
+
+
+def purge_expired_notifications(chunk_size=1000, archive=None, include_unread=False, dry_run=False):
+    """
+    Delete (or archive) expired notifications chunk_size ids at a time, each
+    chunk in its own short transaction so no single statement holds the
+    SQLite write lock for long. Returns the number of rows removed.
+    """
+    if archive is None:
+        archive = settings.NOTIFICATION_ARCHIVE
+
+    expired = expired_notifications(include_unread=include_unread)
+    if dry_run:
+        return expired.count()
+
+    removed = 0
+    unread_owners = set()
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            # Step by the ids that exist, so gaps in the table cost nothing
+            ids = list(expired.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size])
+            if not ids:
+                break
+            last_id = ids[-1]
+            chunk = expired.filter(id__in=ids)
+            if include_unread:
+                unread_owners.update(chunk.filter(is_read=False).values_list('user_id', flat=True))
+            if archive:
+                rows = list(chunk.values(*ARCHIVE_FIELDS))
+                ArchivedNotification.objects.bulk_create(
+                    [ArchivedNotification(original_id=row.pop('id'), **row) for row in rows],
+                    ignore_conflicts=True
+                )
+            deleted, _ = chunk.delete()
+            removed += deleted
+        if len(ids) < chunk_size:
+            break
+
+    if unread_owners:
+        recount_unread(unread_owners)
+    return removed
@@ -4,4 +4,4 @@ from .models import Notification
 class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
-        fields = ['id', 'user', 'task', 'title', 'message', 'notif_type', 'is_read', 'created_at']
+        fields = ['id', 'user', 'task', 'title', 'message', 'notif_type', 'is_read', 'count', 'created_at']
@@ -1,84 +1,47 @@
-from django.db.models.signals import m2m_changed, post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, pre_delete
 from django.dispatch import receiver
+from jobs.queue import enqueue
 from tasks.models import Task
+from tasks.signals import task_status_changed, tasks_bulk_changed
+from .counters import recount_unread
 from .models import Notification
-from django.contrib.auth import get_user_model
 
-User = get_user_model()
+# Recipients are resolved and written by the jobs in notifications/jobs.py,
+# so the request only pays for queueing the event.
 
 # When a task is assigned
 @receiver(m2m_changed, sender=Task.assigned_to.through)
 def task_assigned_notification(sender, instance, action, pk_set, **kwargs):
-    if action == "post_add":
-        for user_id in pk_set:
-            Notification.objects.create(
-                user_id=user_id,
-                task=instance,
-                title="Task Assigned",
-                message=f"You have been assigned to task '{instance.title}'",
-                notif_type="task_assigned"
-            )
-        # Admins should also get notified for assignment
-        admins = User.objects.filter(role='admin')
-        for admin in admins:
-            Notification.objects.create(
-                user=admin,
-                task=instance,
-                title="Task Assignment Update",
-                message=f"Task '{instance.title}' assigned to {instance.assigned_to.all().count()} users",
-                notif_type="admin_task_created"
-            )
+    if action == "post_add" and pk_set:
+        enqueue('notifications.task_assigned', task_id=instance.id, user_ids=sorted(pk_set))
 
-# When a task is updated
+# When a task is created or updated
 @receiver(post_save, sender=Task)
 def task_updated_notification(sender, instance, created, **kwargs):
-    if created:
-        # Task created
-        if instance.created_by.role == 'manager':
-            Notification.objects.create(
-                user=instance.created_by,
-                task=instance,
-                title="Task Created",
-                message=f"New task '{instance.title}' created by you",
-                notif_type="task_assigned"
-            )
-        # Admin notification
-        admins = User.objects.filter(role='admin')
-        for admin in admins:
-            Notification.objects.create(
-                user=admin,
-                task=instance,
-                title="New Task Created",
-                message=f"New task '{instance.title}' created by {instance.created_by.username}",
-                notif_type="admin_task_created"
-            )
-    else:
-        # Task updated
-        for user in instance.assigned_to.all():
-            if user.role == "employee":
-                Notification.objects.create(
-                    user=user,
-                    task=instance,
-                    title="Task Updated",
-                    message=f"Task '{instance.title}' has been updated",
-                    notif_type="task_updated"
-                )
-        # Manager who created the task
-        if instance.created_by.role == 'manager':
-            Notification.objects.create(
-                user=instance.created_by,
-                task=instance,
-                title="Task Activity",
-                message=f"Task '{instance.title}' updated",
-                notif_type="task_updated"
-            )
-        # Admin notification
-        admins = User.objects.filter(role='admin')
-        for admin in admins:
-            Notification.objects.create(
-                user=admin,
-                task=instance,
-                title="Task Update",
-                message=f"Task '{instance.title}' updated by {instance.created_by.username}",
-                notif_type="admin_task_updated"
-            )
+    enqueue('notifications.task_saved', task_id=instance.id, created=created)
+
+# When a status transition updates the task without save()
+@receiver(task_status_changed, sender=Task)
+def task_status_notification(sender, task, **kwargs):
+    enqueue('notifications.task_saved', task_id=task.id, created=False)
+
+# When the batch endpoint creates or updates many tasks at once
+@receiver(tasks_bulk_changed, sender=Task)
+def tasks_batch_notification(sender, created, updated, added, actor, **kwargs):
+    enqueue(
+        'notifications.tasks_batch',
+        created_ids=[task.id for task in created],
+        updated_ids=[task.id for task in updated],
+        assignments=[[task_id, user_id] for task_id, user_ids in added.items() for user_id in sorted(user_ids)],
+        actor_id=actor.id
+    )
+
+# Deleting a task cascades to its notifications, so fix the owners' unread counters
+@receiver(pre_delete, sender=Task)
+def task_deleted_unread_counters(sender, instance, **kwargs):
+    user_ids = set(Notification.objects.filter(
+        task=instance, is_read=False
+    ).values_list('user_id', flat=True))
+    if user_ids:
+        transaction.on_commit(lambda: recount_unread(user_ids))
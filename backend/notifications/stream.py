@@ -0,0 +1,93 @@
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from .broker import get_broker
+from .models import Notification
+from .serializers import NotificationSerializer
+
+REPLAY_LIMIT = 100
+RECONNECT_DELAY_MS = 3000
+
+
+def authenticate_stream(request):
+    # EventSource cannot send headers, so a `token` query param is accepted too
+    auth = JWTAuthentication()
+    try:
+        token = request.GET.get('token')
+        if token:
+            return auth.get_user(auth.get_validated_token(token))
+        result = auth.authenticate(request)
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        return None
+    return result[0] if result else None
+
+
+def missed_notifications(user_id, last_event_id):
+    notifications = Notification.objects.filter(
+        user_id=user_id, id__gt=last_event_id
+    ).order_by('id')[:REPLAY_LIMIT]
+    return NotificationSerializer(notifications, many=True).data
+
+
+def format_event(message, with_id=True):
+    # A re-sent (coalesced) notification keeps its older id, which must not
+    # move the client's Last-Event-ID backwards
+    event_id = f"id: {message['id']}\n" if with_id else ""
+    return f"{event_id}event: notification\ndata: {json.dumps(message)}\n\n"
+
+
+async def event_stream(user_id, last_event_id):
+    subscription = get_broker().subscribe(user_id)
+    try:
+        yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+
+        # Replay what was created while the client was disconnected
+        sent_up_to = last_event_id or 0
+        replayed = {}
+        if last_event_id is not None:
+            for message in await sync_to_async(missed_notifications)(user_id, last_event_id):
+                sent_up_to = message['id']
+                replayed[message['id']] = message['created_at']
+                yield format_event(message)
+
+        while True:
+            message = await subscription.get(settings.NOTIFICATION_STREAM_HEARTBEAT)
+            if message is None:
+                yield ": keep-alive\n\n"
+            elif replayed.get(message['id']) != message['created_at']:
+                yield format_event(message, with_id=message['id'] > sent_up_to)
+                sent_up_to = max(sent_up_to, message['id'])
+    finally:
+        subscription.close()
+
+
+async def notification_stream(request):
+    """
+    Server-Sent Events stream of the user's new notifications. Serve it
+    through ASGI (backend.asgi) so idle connections do not hold a worker
+    thread each.
+    """
+    user = await sync_to_async(authenticate_stream)(request)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."},
+            status=401
+        )
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+
+    response = StreamingHttpResponse(
+        event_stream(user.id, last_event_id),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
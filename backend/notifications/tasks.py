@@ -2,58 +2,126 @@ from datetime import timedelta
 from django.utils import timezone
 from tasks.models import Task
 from django.contrib.auth import get_user_model
+from .counters import recount_unread
 from .models import Notification
 
 User = get_user_model()
 
-def create_due_soon_notifications_for_employees():
-    today = timezone.now().date()
-    due_soon_date = today + timedelta(days=1) 
+ACTIVE_STATUSES = ['todo', 'in_progress']
+SWEEP_CHUNK_SIZE = 500
 
-    tasks_due_soon = Task.objects.filter(due_date=due_soon_date, status__in=['todo', 'in_progress'])
 
-    for task in tasks_due_soon:
-        for user in task.assigned_to.all():
-            if user.role == "employee":
-                Notification.objects.get_or_create(
-                    user=user,
-                    task=task,
-                    message=f"Task '{task.title}' is due tomorrow!",
-                    notif_type="task_due"
-                )
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
 
-def create_manager_notifications():
-    today = timezone.now().date()
-    managers = User.objects.filter(role='manager')
 
-    overdue_tasks = Task.objects.filter(
-        status__in=['todo', 'in_progress'],
-        due_date__lt=today
-    )
+def inserted_keys(notif_type, notifications):
+    """
+    (user_id, task_id) of the bulk_create(ignore_conflicts=True) rows that
+    really went in. A skipped row is either an older one or another run's,
+    so a row only counts if it carries this call's created_at.
+    """
+    stamps = {(n.user_id, n.task_id): n.created_at for n in notifications}
+    rows = Notification.objects.filter(
+        notif_type=notif_type,
+        task_id__in={n.task_id for n in notifications},
+        created_at__gte=min(stamps.values())
+    ).values_list('user_id', 'task_id', 'created_at')
+    return {(user_id, task_id) for user_id, task_id, created_at in rows if stamps.get((user_id, task_id)) == created_at}
+
+
+def write_missing_notifications(notif_type, title, message, recipients):
+    """
+    Insert one `notif_type` notification for every (user, task) pair in
+    `recipients` that does not have one yet.
 
-    for task in overdue_tasks:
-        for manager in managers:
-            Notification.objects.get_or_create(
-                user=manager,
-                task=task,
-                notif_type="manager_task_overdue",
-                message=f"Task '{task.title}' is overdue"
+    `recipients` is a list of (task_id, task_title, user_ids). Existing pairs
+    are looked up once per chunk of tasks and the rest are bulk inserted;
+    the unique constraint on sweep types makes a concurrent run harmless.
+    Returns the number of rows this call actually inserted.
+    """
+    written = 0
+    recipient_ids = set()
+    for chunk in chunked(recipients, SWEEP_CHUNK_SIZE):
+        existing = set(Notification.objects.filter(
+            notif_type=notif_type,
+            task_id__in=[task_id for task_id, _, _ in chunk]
+        ).values_list('user_id', 'task_id'))
+
+        missing = [
+            Notification(
+                user_id=user_id,
+                task_id=task_id,
+                title=title,
+                message=message.format(title=task_title),
+                notif_type=notif_type,
             )
+            for task_id, task_title, user_ids in chunk
+            for user_id in user_ids
+            if (user_id, task_id) not in existing
+        ]
+        if not missing:
+            continue
+        Notification.objects.bulk_create(missing, batch_size=SWEEP_CHUNK_SIZE, ignore_conflicts=True)
+        inserted = inserted_keys(notif_type, missing)
+        written += len(inserted)
+        recipient_ids.update(user_id for user_id, _ in inserted)
 
-def create_admin_overdue_notifications():
+    # Counters are recomputed rather than incremented, in case a concurrent
+    # run inserted some of the same pairs
+    if recipient_ids:
+        recount_unread(recipient_ids)
+    return written
+
+
+def overdue_tasks():
+    today = timezone.now().date()
+    return Task.objects.filter(status__in=ACTIVE_STATUSES, due_date__lt=today)
+
+
+def create_due_soon_notifications_for_employees():
     today = timezone.now().date()
-    admins = User.objects.filter(role='admin')
+    due_soon_date = today + timedelta(days=1)
+
+    assignments = Task.assigned_to.through.objects.filter(
+        task__due_date=due_soon_date,
+        task__status__in=ACTIVE_STATUSES,
+        user__role='employee'
+    ).values_list('task_id', 'task__title', 'user_id').order_by('task_id')
+
+    recipients = {}
+    for task_id, task_title, user_id in assignments:
+        recipients.setdefault((task_id, task_title), []).append(user_id)
 
-    overdue_tasks = Task.objects.filter(
-        status__in=['todo', 'in_progress'],
-        due_date__lt=today
+    return write_missing_notifications(
+        'task_due',
+        "Task Due Soon",
+        "Task '{title}' is due tomorrow!",
+        [(task_id, task_title, user_ids) for (task_id, task_title), user_ids in recipients.items()]
     )
 
-    for task in overdue_tasks:
-        for admin in admins:
-            Notification.objects.get_or_create(
-                user=admin,
-                task=task,
-                notif_type="admin_task_overdue",
-                message=f"Task '{task.title}' is overdue"
-            )
\ No newline at end of file
+
+def create_overdue_notifications(role, notif_type):
+    user_ids = list(User.objects.filter(role=role).values_list('id', flat=True))
+    if not user_ids:
+        return 0
+
+    recipients = [
+        (task_id, task_title, user_ids)
+        for task_id, task_title in overdue_tasks().values_list('id', 'title').order_by('id')
+    ]
+    return write_missing_notifications(
+        notif_type,
+        "Task Overdue",
+        "Task '{title}' is overdue",
+        recipients
+    )
+
+
+def create_manager_notifications():
+    return create_overdue_notifications('manager', 'manager_task_overdue')
+
+
+def create_admin_overdue_notifications():
+    return create_overdue_notifications('admin', 'admin_task_overdue')
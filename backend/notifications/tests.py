@@ -1,3 +1,382 @@
-from django.test import TestCase
+import base64
+import json
+from datetime import timedelta
+from unittest import mock
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from jobs.queue import claim, run_job
+from tasks.models import Task
+from .broker import DatabaseBroker
+from .dispatcher import NotificationDispatcher
+from .counters import recount_unread, unread_count
+from .models import ArchivedNotification, Notification
+from .retention import purge_expired_notifications
+from .tasks import write_missing_notifications
 
-# Create your tests here.
+User = get_user_model()
+
+
+@override_settings(JOBS_EAGER=False)
+class NotificationStreamTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', role='manager')
+        self.employee = User.objects.create_user(username='employee', role='employee')
+        self.broker = DatabaseBroker()
+        # Polls are run by the test itself, on the test's connection
+        self.start_poller = mock.patch.object(self.broker, 'start_poller').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def run_queued_jobs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for job in claim('test-worker', limit=10):
+                self.assertTrue(run_job(job))
+
+    def assign_task(self):
+        task = Task.objects.create(title='Write report', created_by=self.manager)
+        task.assigned_to.add(self.employee)
+        self.run_queued_jobs()
+        return task
+
+    def receive(self, user_ids, *steps):
+        """Run each step then a poll; returns the ids streamed per user and step."""
+        async def stream():
+            subscriptions = {user_id: self.broker.subscribe(user_id) for user_id in user_ids}
+            received = {user_id: [] for user_id in user_ids}
+            try:
+                for step in steps:
+                    await sync_to_async(step)()
+                    await sync_to_async(self.broker.poll)()
+                    for user_id, subscription in subscriptions.items():
+                        messages = []
+                        while (message := await subscription.get(timeout=0.01)) is not None:
+                            messages.append(message['id'])
+                        received[user_id].append(messages)
+            finally:
+                for subscription in subscriptions.values():
+                    subscription.close()
+            return received
+
+        return async_to_sync(stream)()
+
+    def test_notification_written_by_a_job_reaches_the_stream(self):
+        received = self.receive([self.employee.id], self.assign_task)
+
+        notification = Notification.objects.get(user=self.employee, notif_type='task_assigned')
+        self.assertEqual(received[self.employee.id], [[notification.id]])
+
+    def test_each_notification_is_streamed_once(self):
+        received = self.receive([self.employee.id], self.assign_task, lambda: None)
+
+        self.assertEqual([len(messages) for messages in received[self.employee.id]], [1, 0])
+
+    def test_one_poller_serves_every_stream(self):
+        other = User.objects.create_user(username='other', role='employee')
+
+        def notify():
+            for user in (self.employee, other):
+                Notification.objects.create(user=user, title='t', message='m', notif_type='task_assigned')
+
+        # The two inserts, then one read of new and one of coalesced rows for both streams
+        with self.assertNumQueries(4):
+            received = self.receive([self.employee.id, other.id], notify)
+
+        self.start_poller.assert_called_once_with()
+        self.assertEqual(len(received[self.employee.id][0]), 1)
+        self.assertEqual(len(received[other.id][0]), 1)
+
+    def test_a_burst_larger_than_a_batch_is_streamed_whole(self):
+        def burst():
+            Notification.objects.bulk_create([
+                Notification(user=self.employee, title=f'n{i}', message='m', notif_type='task_assigned')
+                for i in range(5)
+            ])
+
+        with mock.patch.object(DatabaseBroker, 'batch_size', 2):
+            received = self.receive([self.employee.id], burst)
+
+        expected = list(Notification.objects.order_by('id').values_list('id', flat=True))
+        self.assertEqual(received[self.employee.id], [expected])
+
+    @override_settings(NOTIFICATION_COALESCE_WINDOW=300)
+    def test_a_coalesced_update_is_streamed_again(self):
+        task = Task.objects.create(title='Write report', created_by=self.manager)
+
+        def notify():
+            dispatcher = NotificationDispatcher(task)
+            dispatcher.add([self.employee.id], title="Task Updated", message='m', notif_type='task_updated')
+            dispatcher.dispatch()
+
+        received = self.receive([self.employee.id], notify, notify, lambda: None)
+
+        notification = Notification.objects.get(user=self.employee)
+        self.assertEqual(received[self.employee.id], [[notification.id], [notification.id], []])
+
+    def test_the_poller_stops_with_the_last_subscription(self):
+        self.broker.interval = 0
+        self.receive([self.employee.id])
+
+        with mock.patch.object(self.broker, 'poll') as poll:
+            self.broker.run()
+
+        poll.assert_not_called()
+        self.assertIsNone(self.broker.poller)
+
+
+@override_settings(NOTIFICATION_STREAM_POLL_INTERVAL=0.01)
+class NotificationPollerTests(TransactionTestCase):
+    def test_rows_committed_elsewhere_reach_the_stream(self):
+        employee = User.objects.create_user(username='employee', role='employee')
+        broker = DatabaseBroker()
+
+        async def stream():
+            subscription = broker.subscribe(employee.id)
+            poller = broker.poller
+            try:
+                notification = await sync_to_async(Notification.objects.create)(
+                    user=employee, title='t', message='m', notif_type='task_assigned'
+                )
+                message = await subscription.get(timeout=5)
+            finally:
+                subscription.close()
+            return notification, message, poller
+
+        notification, message, poller = async_to_sync(stream)()
+        self.assertEqual(message['id'], notification.id)
+        poller.join(timeout=5)
+        self.assertFalse(poller.is_alive())
+        self.assertIsNone(broker.poller)
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+class InboxCursorTests(TestCase):
+    def setUp(self):
+        self.employee = User.objects.create_user(username='employee', role='employee')
+        Notification.objects.bulk_create([
+            Notification(user=self.employee, title=f'n{i}', message='m', notif_type='task_assigned')
+            for i in range(5)
+        ])
+        self.client = APIClient()
+        self.client.force_authenticate(self.employee)
+
+    def test_pages_follow_the_cursor_without_gaps_or_repeats(self):
+        seen = []
+        response = self.client.get('/api/notifications/employee/?limit=2')
+        while True:
+            self.assertEqual(response.status_code, 200)
+            seen += [row['id'] for row in response.data]
+            cursor = response.get('X-Next-Cursor')
+            if not cursor:
+                break
+            response = self.client.get(f'/api/notifications/employee/?limit=2&cursor={cursor}')
+
+        expected = list(Notification.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_malformed_cursors_are_rejected(self):
+        cursors = [
+            'not base64!',
+            encode_cursor({'id': 1}),
+            encode_cursor([1]),
+            encode_cursor(['abc', 1]),
+            encode_cursor([True, True]),
+            encode_cursor([None, 1]),
+            encode_cursor(['2026-01-01T00:00:00+00:00', 'abc']),
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get('/api/notifications/employee/', {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(str(response.data['cursor']), 'Invalid cursor')
+
+    def test_mark_read_with_malformed_ids_is_rejected(self):
+        for ids in ([True], [1, False], ['1'], 1):
+            response = self.client.post('/api/notifications/employee/', {'ids': ids}, format='json')
+            self.assertEqual(response.status_code, 400, ids)
+        self.assertFalse(Notification.objects.filter(is_read=True).exists())
+
+    def test_mark_read_up_to_a_malformed_cursor_is_rejected(self):
+        response = self.client.post('/api/notifications/employee/', {'up_to': encode_cursor([True, 1])}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(JOBS_EAGER=False, NOTIFICATION_COALESCE_WINDOW=300)
+class CoalesceTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', role='manager')
+        self.employee = User.objects.create_user(username='employee', role='employee')
+        self.report = Task.objects.create(title='Write report', created_by=self.manager)
+        self.review = Task.objects.create(title='Review code', created_by=self.manager)
+
+    def notify(self, task, message):
+        dispatcher = NotificationDispatcher(task)
+        dispatcher.add([self.employee.id], title="Task Updated", message=message, notif_type='task_updated')
+        dispatcher.dispatch()
+
+    def test_a_merged_update_moves_to_the_top_of_the_inbox(self):
+        self.notify(self.report, 'first')
+        self.notify(self.review, 'other')
+        self.notify(self.report, 'second')
+
+        rows = list(Notification.objects.filter(user=self.employee).order_by('-created_at', '-id'))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual((rows[0].task_id, rows[0].count, rows[0].message), (self.report.id, 2, 'second'))
+
+    def test_the_window_slides_with_each_merge(self):
+        self.notify(self.report, 'first')
+        Notification.objects.update(created_at=timezone.now() - timedelta(seconds=250))
+        self.notify(self.report, 'second')
+        Notification.objects.update(created_at=timezone.now() - timedelta(seconds=250))
+        self.notify(self.report, 'third')
+
+        self.assertEqual(Notification.objects.get().count, 3)
+
+    def test_a_merged_update_is_published(self):
+        with mock.patch('notifications.dispatcher.publish_notifications') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.notify(self.report, 'first')
+            with self.captureOnCommitCallbacks(execute=True):
+                self.notify(self.report, 'second')
+
+        first, second = [call.args[0] for call in publish.call_args_list]
+        self.assertEqual(first[0].id, second[0].id)
+        self.assertEqual((second[0].count, second[0].message), (2, 'second'))
+
+
+class SweepTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', role='manager')
+        self.employees = [User.objects.create_user(username=f'employee{i}', role='employee') for i in range(3)]
+        self.task = Task.objects.create(title='Write report', created_by=self.manager)
+
+    def sweep(self):
+        return write_missing_notifications(
+            'task_due', "Task Due Soon", "Task '{title}' is due tomorrow!",
+            [(self.task.id, self.task.title, [e.id for e in self.employees])]
+        )
+
+    def test_a_repeated_sweep_writes_nothing(self):
+        self.assertEqual(self.sweep(), 3)
+        self.assertEqual(self.sweep(), 0)
+        self.assertEqual(Notification.objects.count(), 3)
+
+    def test_rows_inserted_by_a_concurrent_sweep_are_not_counted(self):
+        bulk_create = Notification.objects.bulk_create
+
+        def concurrent_insert(objs, **kwargs):
+            # Another sweep writes one of the same pairs after our lookup
+            Notification.objects.create(
+                user=self.employees[0], task=self.task, title='Task Due Soon', message='m', notif_type='task_due'
+            )
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(Notification.objects, 'bulk_create', side_effect=concurrent_insert):
+            self.assertEqual(self.sweep(), 2)
+        self.assertEqual(Notification.objects.count(), 3)
+
+
+@override_settings(NOTIFICATION_RETENTION_DAYS={'default': 90, 'task_updated': 30})
+class RetentionTests(TestCase):
+    def setUp(self):
+        self.employee = User.objects.create_user(username='employee', role='employee')
+        # (notif_type, age in days, is_read)
+        self.notify([
+            ('task_assigned', 100, True),
+            ('task_assigned', 100, False),
+            ('task_assigned', 10, True),
+            ('task_updated', 40, True),
+            ('task_updated', 40, False),
+            ('task_updated', 10, False),
+        ])
+
+    def notify(self, rows, ids=None):
+        now = timezone.now()
+        for i, (notif_type, age, is_read) in enumerate(rows):
+            notification = Notification.objects.create(
+                id=ids[i] if ids else None, user=self.employee, title=f'{notif_type} {age} {is_read}', message='m',
+                notif_type=notif_type, is_read=is_read
+            )
+            Notification.objects.filter(pk=notification.pk).update(created_at=now - timedelta(days=age))
+        recount_unread()
+
+    def remaining(self):
+        return sorted(Notification.objects.values_list('notif_type', 'is_read'))
+
+    def test_only_read_notifications_past_their_type_limit_are_purged(self):
+        self.assertEqual(purge_expired_notifications(chunk_size=2), 2)
+
+        self.assertEqual(self.remaining(), [
+            ('task_assigned', False), ('task_assigned', True), ('task_updated', False), ('task_updated', False)
+        ])
+        self.assertEqual(unread_count(self.employee.id), 3)
+
+    def test_purging_unread_notifications_adjusts_the_counter(self):
+        self.assertEqual(unread_count(self.employee.id), 3)
+
+        self.assertEqual(purge_expired_notifications(chunk_size=2, include_unread=True), 4)
+
+        self.assertEqual(self.remaining(), [('task_assigned', True), ('task_updated', False)])
+        self.assertEqual(unread_count(self.employee.id), 1)
+
+    def test_archived_notifications_keep_their_original_ids(self):
+        expired = dict(Notification.objects.filter(
+            title__in=['task_assigned 100 True', 'task_updated 40 True']
+        ).values_list('id', 'title'))
+
+        self.assertEqual(purge_expired_notifications(archive=True), 2)
+
+        self.assertEqual(dict(ArchivedNotification.objects.values_list('original_id', 'title')), expired)
+        self.assertFalse(Notification.objects.filter(id__in=expired).exists())
+
+    def test_gaps_between_ids_cost_no_queries(self):
+        self.notify([('task_assigned', 100, True)] * 3, ids=[10_000, 50_000, 90_000])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(purge_expired_notifications(chunk_size=2), 5)
+
+        self.assertLess(len(queries), 20)
+
+
+@override_settings(JOBS_EAGER=False, NOTIFICATION_RETENTION_DAYS={'default': 90})
+class UnreadCounterTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', role='manager')
+        self.employee = User.objects.create_user(username='employee', role='employee')
+        self.client = APIClient()
+        self.client.force_authenticate(self.employee)
+
+    def assertCounterMatches(self, expected):
+        response = self.client.get('/api/notifications/unread-count/')
+        self.assertEqual(response.data['unread_count'], expected)
+        self.assertEqual(expected, Notification.objects.filter(user=self.employee, is_read=False).count())
+
+    def test_counter_follows_creates_reads_deletes_and_purges(self):
+        tasks = [Task.objects.create(title=f'Task {i}', created_by=self.manager) for i in range(6)]
+        for task in tasks:
+            dispatcher = NotificationDispatcher(task)
+            dispatcher.add([self.employee.id], title="Task Assigned", message='m', notif_type='task_assigned')
+            dispatcher.dispatch()
+        self.assertCounterMatches(6)
+
+        newest = Notification.objects.order_by('-created_at', '-id')
+        self.client.post('/api/notifications/employee/', {'ids': [newest[0].id]}, format='json')
+        self.assertCounterMatches(5)
+
+        page = self.client.get('/api/notifications/employee/?limit=3')
+        self.client.post('/api/notifications/employee/', {'up_to': page['X-Next-Cursor']}, format='json')
+        self.assertCounterMatches(3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tasks[0].delete()
+        self.assertCounterMatches(2)
+
+        Notification.objects.filter(task=tasks[1]).update(created_at=timezone.now() - timedelta(days=100))
+        purge_expired_notifications(include_unread=True)
+        self.assertCounterMatches(1)
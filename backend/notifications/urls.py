@@ -1,8 +1,11 @@
 from django.urls import path
-from .views import EmployeeNotificationView, ManagerNotificationView,AdminNotificationView
+from .stream import notification_stream
+from .views import EmployeeNotificationView, ManagerNotificationView,AdminNotificationView, UnreadNotificationCountView
 
 urlpatterns = [
     path('employee/', EmployeeNotificationView.as_view(), name='employee-notifications'),
     path('manager/', ManagerNotificationView.as_view(), name='manager-notifications'),
     path('admin/', AdminNotificationView.as_view(),name="admin-notifications"),
+    path('stream/', notification_stream, name='notification-stream'),
+    path('unread-count/', UnreadNotificationCountView.as_view(), name='unread-notification-count'),
 ]
\ No newline at end of file
@@ -1,63 +1,78 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from backend.pagination import KeysetPaginator
+from .counters import decrement_unread, unread_count
 from .models import Notification
 from .serializers import NotificationSerializer
 from users.permissions import IsEmployee, IsManager,IsAdmin
 
-class EmployeeNotificationView(APIView):
-    permission_classes = [IsAuthenticated, IsEmployee]
+inbox_paginator = KeysetPaginator(ordering=('-created_at', '-id'))
+
+
+class NotificationInboxView(APIView):
+    """
+    GET returns one page of the user's inbox, newest first; pass `cursor`
+    from the X-Next-Cursor header for the next page, `limit` for the page
+    size and `unread=true` for unread notifications only.
+
+    POST marks notifications read: `ids` marks the listed ones, `up_to`
+    marks everything down to and including that cursor, and an empty body
+    marks all of them.
+    """
+    permission_classes = [IsAuthenticated]
+    read_all_message = "All notifications marked as read"
 
     def get(self, request):
-        notifications = Notification.objects.filter(
-            user=request.user
-        ).order_by('-created_at')
+        notifications = Notification.objects.filter(user=request.user)
+        if request.query_params.get('unread') in ('1', 'true'):
+            notifications = notifications.filter(is_read=False)
 
-        return Response(NotificationSerializer(notifications, many=True).data)
+        page, next_cursor = inbox_paginator.paginate(notifications, request)
+        return inbox_paginator.get_response(
+            NotificationSerializer(page, many=True).data, next_cursor
+        )
 
     def post(self, request):
-        Notification.objects.filter(
+        notifications = Notification.objects.filter(
             user=request.user,
             is_read=False
-        ).update(is_read=True)
+        )
 
-        return Response({"message": "All notifications marked as read"})
+        ids = request.data.get('ids')
+        up_to = request.data.get('up_to')
+        if ids is not None:
+            # A bool would pass as an integer id
+            if not isinstance(ids, list) or not all(type(i) is int for i in ids):
+                raise ValidationError({"ids": "Must be a list of notification ids"})
+            notifications = notifications.filter(id__in=ids)
+        elif up_to:
+            notifications = notifications.exclude(inbox_paginator.after(up_to, notifications))
 
+        updated = notifications.update(is_read=True)
+        decrement_unread(request.user.id, updated)
 
-class ManagerNotificationView(APIView):
-    permission_classes = [IsAuthenticated, IsManager]
+        if ids is None and not up_to:
+            return Response({"message": self.read_all_message, "updated": updated})
+        return Response({"message": "Notifications marked as read", "updated": updated})
 
-    def get(self, request):
-        notifications = Notification.objects.filter(
-            user=request.user
-        ).order_by('-created_at')
 
-        return Response(NotificationSerializer(notifications, many=True).data)
+class EmployeeNotificationView(NotificationInboxView):
+    permission_classes = [IsAuthenticated, IsEmployee]
 
-    def post(self, request):
-        Notification.objects.filter(
-            user=request.user,
-            is_read=False
-        ).update(is_read=True)
 
-        return Response({"message": "All notifications marked as read"})
+class ManagerNotificationView(NotificationInboxView):
+    permission_classes = [IsAuthenticated, IsManager]
 
-class AdminNotificationView(APIView):
-    permission_classes = [IsAuthenticated, IsAdmin]
 
-    def get(self, request):
-        notifications = Notification.objects.filter(
-            user=request.user
-        ).order_by('-created_at')
+class AdminNotificationView(NotificationInboxView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+    read_all_message = "All admin notifications marked as read"
 
-        return Response(
-            NotificationSerializer(notifications, many=True).data
-        )
 
-    def post(self, request):
-        Notification.objects.filter(
-            user=request.user,
-            is_read=False
-        ).update(is_read=True)
+class UnreadNotificationCountView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        return Response({"message": "All admin notifications marked as read"})
\ No newline at end of file
+    def get(self, request):
+        return Response({"unread_count": unread_count(request.user.id)})
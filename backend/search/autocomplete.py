@@ -0,0 +1,165 @@
+import logging
+import threading
+import time
+from bisect import bisect_left, insort
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, connection
+from tasks.models import Task, TaskGroup
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+KINDS = ('users', 'tasks', 'groups')
+
+
+def entry_keys(label):
+    # One key per word start, so "backend" finds "Deploy backend server"
+    words = label.lower().split()
+    return [' '.join(words[i:]) for i in range(len(words))]
+
+
+def documents():
+    """(kind, id, label) for everything the autocomplete box can suggest."""
+    for pk, username in User.objects.filter(role='employee').values_list('id', 'username'):
+        yield 'users', pk, username
+    for pk, title in Task.objects.values_list('id', 'title'):
+        yield 'tasks', pk, title
+    for pk, name in TaskGroup.objects.values_list('id', 'name'):
+        yield 'groups', pk, name
+
+
+class PrefixIndex:
+    """
+    Sorted array of (key, kind, id) with a key per word start of each label;
+    a prefix lookup is one bisect plus a scan over the matching run. Lives
+    in process memory and follows model signals. It is built when the
+    worker starts (warm) and rebuilt in a background thread once older
+    than AUTOCOMPLETE_MAX_AGE seconds; a rebuild scans the tables without
+    holding the lookup lock and swaps the new arrays in at the end.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        # One rebuild at a time; lookups never wait for it
+        self.build_lock = threading.Lock()
+        self.keys = []
+        self.labels = {}
+        self.built_at = None
+        self.build_seconds = None
+        # add/discard calls made while a rebuild scans, replayed on its result
+        self.journal = None
+
+    def build(self, max_age=None):
+        """
+        Scan the tables into a new index and swap it in. With `max_age`,
+        skip the scan if another thread built one that recently.
+        """
+        with self.build_lock:
+            if max_age is not None and self.built_at is not None and time.monotonic() - self.built_at <= max_age:
+                return
+            started = time.monotonic()
+            with self.lock:
+                self.journal = []
+            try:
+                labels = {(kind, pk): label for kind, pk, label in documents()}
+                keys = sorted(
+                    (key, kind, pk) for (kind, pk), label in labels.items() for key in entry_keys(label)
+                )
+            except BaseException:
+                with self.lock:
+                    self.journal = None
+                raise
+
+            with self.lock:
+                journal, self.journal = self.journal, None
+                self.keys, self.labels = keys, labels
+                for change, args in journal:
+                    change(*args)
+                self.built_at = time.monotonic()
+                self.build_seconds = self.built_at - started
+
+    def refresh(self):
+        """Rebuild from a background thread, which owns its own connection."""
+        try:
+            self.build(max_age=settings.AUTOCOMPLETE_MAX_AGE)
+        except DatabaseError:
+            logger.exception("Autocomplete index rebuild failed")
+        finally:
+            connection.close()
+
+    def warm(self):
+        """Start the first build when a worker starts, before any request needs it."""
+        threading.Thread(target=self.refresh, name='autocomplete-warm', daemon=True).start()
+
+    def ensure_built(self):
+        built_at = self.built_at
+        if built_at is None:
+            # Only before the first build: wait for the warm-up, or build now
+            self.build(max_age=settings.AUTOCOMPLETE_MAX_AGE)
+        elif time.monotonic() - built_at > settings.AUTOCOMPLETE_MAX_AGE and not self.build_lock.locked():
+            # Serve the current index while a fresh one is built
+            threading.Thread(target=self.refresh, name='autocomplete-refresh', daemon=True).start()
+
+    def is_built(self):
+        # A build in progress counts: its journal keeps the changes
+        return self.built_at is not None or self.journal is not None
+
+    def add(self, kind, pk, label):
+        with self.lock:
+            if self.journal is not None:
+                self.journal.append((self.add, (kind, pk, label)))
+            self.remove_entry(kind, pk)
+            self.labels[(kind, pk)] = label
+            for key in entry_keys(label):
+                insort(self.keys, (key, kind, pk))
+
+    def discard(self, kind, pk):
+        with self.lock:
+            if self.journal is not None:
+                self.journal.append((self.discard, (kind, pk)))
+            self.remove_entry(kind, pk)
+
+    def remove_entry(self, kind, pk):
+        label = self.labels.pop((kind, pk), None)
+        if label is None:
+            return
+        for key in entry_keys(label):
+            i = bisect_left(self.keys, (key, kind, pk))
+            if i < len(self.keys) and self.keys[i] == (key, kind, pk):
+                del self.keys[i]
+
+    def search(self, prefix, limits, allowed=None):
+        """
+        {kind: [ids]} for labels with a word starting with prefix, up to
+        limits[kind] each. `allowed` maps a kind to the set of ids that may
+        be returned for it; others are skipped without counting to the limit.
+        """
+        prefix = ' '.join(prefix.lower().split())
+        found = {kind: {} for kind in limits}
+        allowed = allowed or {}
+        with self.lock:
+            i = bisect_left(self.keys, (prefix,))
+            while i < len(self.keys) and self.keys[i][0].startswith(prefix):
+                _, kind, pk = self.keys[i]
+                ids = found.get(kind)
+                if ids is not None and len(ids) < limits[kind] and (kind not in allowed or pk in allowed[kind]):
+                    ids[pk] = None
+                    if all(len(found[k]) >= limits[k] for k in found):
+                        break
+                i += 1
+        return {kind: list(ids) for kind, ids in found.items()}
+
+    def label(self, kind, pk):
+        return self.labels.get((kind, pk))
+
+    def stats(self):
+        return {
+            "size": len(self.labels),
+            "keys": len(self.keys),
+            "build_seconds": self.build_seconds,
+            "age_seconds": time.monotonic() - self.built_at if self.built_at else None,
+        }
+
+
+autocomplete_index = PrefixIndex()
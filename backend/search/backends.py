@@ -0,0 +1,156 @@
+import re
+from functools import reduce
+from operator import or_
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from tasks.models import Task
+
+User = get_user_model()
+
+# model -> text fields that make up its search document
+SEARCH_DOCUMENTS = {
+    Task: ('title', 'description'),
+    User: ('username', 'email', 'department'),
+}
+
+# Backend used per database vendor when SEARCH_BACKEND is not set; the
+# search migrations only create the FTS5 tables on SQLite
+VENDOR_BACKENDS = {
+    'sqlite': 'search.backends.SQLiteFTSBackend',
+}
+FALLBACK_BACKEND = 'search.backends.LikeSearchBackend'
+
+_backend = None
+
+
+def backend_path(vendor):
+    return settings.SEARCH_BACKEND or VENDOR_BACKENDS.get(vendor, FALLBACK_BACKEND)
+
+
+def get_search_backend():
+    global _backend
+    if _backend is None:
+        _backend = import_string(backend_path(connection.vendor))()
+    return _backend
+
+
+def search_terms(keyword):
+    return re.findall(r'\w+', keyword.lower())
+
+
+class BaseSearchBackend:
+    """
+    Full-text search over SEARCH_DOCUMENTS. `search` narrows a queryset of
+    one of those models to rows matching every term of the keyword (each
+    as a prefix) and orders it by relevance, so role scoping stays in the
+    queryset the caller passes in. `index` and `remove` are called from
+    model signals to keep the backend's index current. Only the SQLite
+    FTS5 and unindexed LIKE backends ship here; a database-specific one
+    (e.g. a Postgres tsvector backend) would implement the same four
+    methods and be named in SEARCH_BACKEND.
+
+    `ordering` is the unique sort key `search` orders by, used as the keyset
+    for paging through results.
+    """
+    ordering = ('id',)
+
+    def search(self, queryset, keyword):
+        raise NotImplementedError
+
+    def index(self, model, objects):
+        raise NotImplementedError
+
+    def remove(self, model, ids):
+        raise NotImplementedError
+
+    def rebuild(self):
+        """Re-index every row; returns the number of documents written."""
+        raise NotImplementedError
+
+
+class LikeSearchBackend(BaseSearchBackend):
+    """Unindexed icontains matching, for databases without a full-text setup."""
+
+    def search(self, queryset, keyword):
+        fields = SEARCH_DOCUMENTS[queryset.model]
+        terms = search_terms(keyword)
+        if not terms:
+            return queryset.none()
+        for term in terms:
+            queryset = queryset.filter(reduce(or_, [Q(**{f'{f}__icontains': term}) for f in fields]))
+        return queryset.order_by(*self.ordering)
+
+    def index(self, model, objects):
+        pass
+
+    def remove(self, model, ids):
+        pass
+
+    def rebuild(self):
+        return 0
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """
+    SQLite FTS5 tables (search_<model>_fts, created by the search
+    migrations) keyed by the row's primary key, ranked with bm25().
+    """
+    ordering = ('search_rank', 'id')
+
+    def table(self, model):
+        return f'search_{model._meta.model_name}_fts'
+
+    def match_query(self, keyword):
+        # Every term must match, each as a prefix: "ali"* "dev"*
+        return ' '.join('"{}"*'.format(term.replace('"', '""')) for term in search_terms(keyword))
+
+    def search(self, queryset, keyword):
+        match = self.match_query(keyword)
+        if not match:
+            # Still annotated, so callers can keep ordering by the rank
+            return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+        model = queryset.model
+        table = self.table(model)
+        pk = f'"{model._meta.db_table}"."{model._meta.pk.column}"'
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {table} WHERE {table} MATCH %s', [match])
+        ).annotate(search_rank=RawSQL(
+            f'SELECT bm25({table}) FROM {table} WHERE {table} MATCH %s AND rowid = {pk}', [match],
+            output_field=FloatField()
+        )).order_by(*self.ordering)
+
+    def index(self, model, objects):
+        fields = SEARCH_DOCUMENTS[model]
+        rows = [[obj.pk] + [getattr(obj, field) or '' for field in fields] for obj in objects]
+        if not rows:
+            return
+        table = self.table(model)
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {table} WHERE rowid = %s', [[row[0]] for row in rows])
+            cursor.executemany(
+                f'INSERT INTO {table} (rowid, {", ".join(fields)}) VALUES ({", ".join(["%s"] * (len(fields) + 1))})',
+                rows
+            )
+
+    def remove(self, model, ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table(model)} WHERE rowid = %s', [[pk] for pk in ids])
+
+    def rebuild(self):
+        written = 0
+        with connection.cursor() as cursor:
+            for model, fields in SEARCH_DOCUMENTS.items():
+                table = self.table(model)
+                columns = ', '.join(fields)
+                values = ', '.join(f"COALESCE({field}, '')" for field in fields)
+                cursor.execute(f'DELETE FROM {table}')
+                cursor.execute(
+                    f'INSERT INTO {table} (rowid, {columns}) '
+                    f'SELECT {model._meta.pk.column}, {values} FROM {model._meta.db_table}'
+                )
+                written += cursor.rowcount
+        return written
@@ -0,0 +1,14 @@
+import time
+from django.core.management.base import BaseCommand
+from search.backends import get_search_backend
+
+class Command(BaseCommand):
+    help = 'Re-index every task and user in the configured search backend'
+
+    def handle(self, *args, **kwargs):
+        started = time.monotonic()
+        documents = get_search_backend().rebuild()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Search index rebuilt: {documents} documents in {elapsed:.2f}s.'
+        ))
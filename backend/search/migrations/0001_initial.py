@@ -0,0 +1,42 @@
+from django.db import migrations
+
+# FTS5 tables behind search.backends.SQLiteFTSBackend; other databases
+# use another SEARCH_BACKEND and skip them
+TABLES = {
+    'search_task_fts': ('tasks_task', ['title', 'description']),
+    'search_user_fts': ('users_user', ['username', 'email', 'department']),
+}
+
+
+def create_fts_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table, (source, columns) in TABLES.items():
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {table} USING fts5({', '.join(columns)}, tokenize='unicode61')"
+        )
+        values = ', '.join(f"COALESCE({column}, '')" for column in columns)
+        schema_editor.execute(
+            f"INSERT INTO {table} (rowid, {', '.join(columns)}) SELECT id, {values} FROM {source}"
+        )
+
+
+def drop_fts_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table in TABLES:
+        schema_editor.execute(f'DROP TABLE {table}')
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('tasks', '0010_task_completed_at_status_log'),
+        ('users', '0006_alter_user_phone'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_tables, drop_fts_tables),
+    ]
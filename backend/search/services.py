@@ -1,39 +1,148 @@
-from django.db.models import Q
 from django.contrib.auth import get_user_model
-from tasks.models import Task
+from django.db.models import Count
+from backend.pagination import KeysetPaginator
+from dashboard.filters import parse_status
+from tasks.filters import parse_int, parse_param
+from tasks.visibility import searchable_tasks
+from rest_framework.exceptions import ValidationError
+from .autocomplete import KINDS, autocomplete_index
+from .backends import get_search_backend
 
 User = get_user_model()
 
-def global_search(keyword, user):
-    if not keyword:
-        return {
-            "employees": [],
-            "tasks": []
+SEARCH_TYPES = ('employees', 'tasks')
+# result type -> facet params that narrow it and their parsers
+SEARCH_FILTERS = {
+    'employees': {'department': str},
+    'tasks': {'status': parse_status, 'group': parse_int},
+}
+
+
+def search_filters(kind, params):
+    """The facet params given for one result type, parsed: {name: value}."""
+    filters = {}
+    for name, parser in SEARCH_FILTERS[kind].items():
+        value = parse_param(params, name, parser)
+        if value is not None:
+            filters[name] = value
+    return filters
+
+
+def search_base(kind, user, keyword, filters):
+    """Ranked matches of one result type, narrowed by the given facet filters."""
+    if kind == 'employees':
+        queryset = User.objects.filter(role='employee')
+    else:
+        queryset = searchable_tasks(user)
+    queryset = get_search_backend().search(queryset, keyword)
+
+    for name, value in filters.items():
+        queryset = queryset.filter(**{'group_id' if name == 'group' else name: value})
+    return queryset
+
+
+def facet_rows(kind, user, keyword, filters, name, *fields):
+    """
+    Counts per value of one facet, over the matches narrowed by every other
+    facet filter, so choosing a value still lists the alternatives.
+    """
+    others = {other: value for other, value in filters.items() if other != name}
+    return list(
+        search_base(kind, user, keyword, others).order_by().values(*fields).annotate(count=Count('id'))
+    )
+
+
+def search_facets(kind, user, keyword, filters, base):
+    """
+    Facet counts and the total. The total is summed from a facet that is
+    not filtered on, whose counts cover exactly the page's base; only when
+    every facet is filtered does it take its own COUNT.
+    """
+    total = None
+    if kind == 'employees':
+        rows = facet_rows(kind, user, keyword, filters, 'department', 'department')
+        if 'department' not in filters:
+            total = sum(row['count'] for row in rows)
+        facets = {
+            "department": sorted(
+                ({"value": row['department'], "count": row['count']} for row in rows),
+                key=lambda row: (-row['count'], row['value'] or '')
+            )
         }
-    
-    employees_qs = User.objects.filter(role='employee')
-    tasks_qs = Task.objects.all()
+    else:
+        statuses = facet_rows(kind, user, keyword, filters, 'status', 'status')
+        groups = facet_rows(kind, user, keyword, filters, 'group', 'group_id', 'group__name')
+        for name, rows in (('status', statuses), ('group', groups)):
+            if name not in filters:
+                total = sum(row['count'] for row in rows)
+        facets = {
+            "status": [
+                {"value": row['status'], "count": row['count']}
+                for row in sorted(statuses, key=lambda row: (-row['count'], row['status']))
+            ],
+            "group": [
+                {"id": row['group_id'], "name": row['group__name'], "count": row['count']}
+                for row in sorted(groups, key=lambda row: (-row['count'], row['group_id'] or 0))
+            ],
+        }
+    if total is None:
+        total = base.count()
+    return total, facets
+
+
+def global_search(params, user):
+    """
+    One page per result type (`types`, default both) with its own cursor
+    (`employees_cursor`, `tasks_cursor`), the total and facet counts. Each
+    facet is counted with every facet filter applied except its own.
+    """
+    keyword = params.get('q', '').strip()
+    kinds = params.get('types')
+    kinds = list(dict.fromkeys(kinds.split(','))) if kinds else list(SEARCH_TYPES)
+    if not set(kinds) <= set(SEARCH_TYPES):
+        raise ValidationError({"types": f"Must be any of {', '.join(SEARCH_TYPES)}"})
+    limit = min(parse_param(params, 'limit', parse_int) or 10, 50)
 
-    if user.role == 'employee':
-        tasks_qs = tasks_qs.filter(assigned_to=user)
+    # Keyset on the backend's ranking, so later pages are range scans too
+    paginator = KeysetPaginator(get_search_backend().ordering)
+    results = {}
+    for kind in kinds:
+        if not keyword:
+            results[kind] = {"results": [], "next_cursor": None, "total": 0, "facets": {}}
+            continue
+        filters = search_filters(kind, params)
+        base = search_base(kind, user, keyword, filters)
+        rows, next_cursor = paginator.page(base, params.get(f'{kind}_cursor'), limit)
+        total, facets = search_facets(kind, user, keyword, filters, base)
+        results[kind] = {"results": rows, "next_cursor": next_cursor, "total": total, "facets": facets}
+    return keyword, results
 
-    if user.role == 'manager':
-        tasks_qs = tasks_qs.filter(
-            Q(created_by=user) | Q(assigned_to=user)
-        )
 
-    employees = employees_qs.filter(
-        Q(username__icontains=keyword) |
-        Q(email__icontains=keyword) |
-        Q(department__icontains=keyword)
-    )[:10]
+def autocomplete(params, user):
+    query = params.get('q', '').strip()
+    kinds = params.get('types')
+    kinds = list(dict.fromkeys(kinds.split(','))) if kinds else list(KINDS)
+    if not set(kinds) <= set(KINDS):
+        raise ValidationError({"types": f"Must be any of {', '.join(KINDS)}"})
+    if user.role not in ['admin', 'manager'] and 'groups' in kinds:
+        # Task groups are only listed for admins and managers
+        kinds.remove('groups')
+    limit = min(parse_param(params, 'limit', parse_int) or 8, 20)
 
-    tasks = tasks_qs.filter(
-        Q(title__icontains=keyword) |
-        Q(description__icontains=keyword)
-    )[:10]
+    autocomplete_index.ensure_built()
+    found = {kind: [] for kind in kinds}
+    if query:
+        allowed = {}
+        if 'tasks' in kinds and user.role != 'admin':
+            # Scoped while walking the index, so the limit counts visible tasks only
+            allowed['tasks'] = set(searchable_tasks(user).values_list('id', flat=True))
+        found = autocomplete_index.search(query, {kind: limit for kind in kinds}, allowed)
 
     return {
-        "employees": employees,
-        "tasks": tasks
+        "query": query,
+        "results": {
+            kind: [{"id": pk, "label": autocomplete_index.label(kind, pk)} for pk in ids]
+            for kind, ids in found.items()
+        },
+        "index": autocomplete_index.stats(),
     }
@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from tasks.models import Task, TaskGroup
+from tasks.signals import tasks_bulk_changed
+from .autocomplete import autocomplete_index
+from .backends import get_search_backend
+
+User = get_user_model()
+
+# Keep the full-text index in step with the searchable rows
+
+
+@receiver(post_save, sender=Task)
+def task_saved_search(sender, instance, **kwargs):
+    get_search_backend().index(Task, [instance])
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def tasks_bulk_search(sender, created, updated, **kwargs):
+    get_search_backend().index(Task, created + updated)
+
+
+@receiver(post_save, sender=User)
+def user_saved_search(sender, instance, update_fields=None, **kwargs):
+    # Logging in only touches last_login
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    get_search_backend().index(User, [instance])
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=User)
+def search_row_deleted(sender, instance, **kwargs):
+    get_search_backend().remove(sender, [instance.pk])
+
+
+# Autocomplete index of this process; skipped until it is first built
+
+
+@receiver(post_save, sender=Task)
+def task_saved_autocomplete(sender, instance, **kwargs):
+    if autocomplete_index.is_built():
+        autocomplete_index.add('tasks', instance.pk, instance.title)
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def tasks_bulk_autocomplete(sender, created, updated, **kwargs):
+    if autocomplete_index.is_built():
+        for task in created + updated:
+            autocomplete_index.add('tasks', task.pk, task.title)
+
+
+@receiver(post_save, sender=TaskGroup)
+def group_saved_autocomplete(sender, instance, **kwargs):
+    if autocomplete_index.is_built():
+        autocomplete_index.add('groups', instance.pk, instance.name)
+
+
+@receiver(post_save, sender=User)
+def user_saved_autocomplete(sender, instance, **kwargs):
+    if not autocomplete_index.is_built():
+        return
+    if instance.role == 'employee':
+        autocomplete_index.add('users', instance.pk, instance.username)
+    else:
+        autocomplete_index.discard('users', instance.pk)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=TaskGroup)
+@receiver(post_delete, sender=User)
+def row_deleted_autocomplete(sender, instance, **kwargs):
+    kind = {Task: 'tasks', TaskGroup: 'groups'}.get(sender, 'users')
+    autocomplete_index.discard(kind, instance.pk)
@@ -1,3 +1,186 @@
-from django.test import TestCase
+import base64
+import json
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from tasks.models import Task, TaskGroup
+from . import backends
+from .autocomplete import PrefixIndex
+from .backends import LikeSearchBackend, SQLiteFTSBackend, backend_path
 
-# Create your tests here.
+User = get_user_model()
+
+
+class SearchBackendSelectionTests(TestCase):
+    @override_settings(SEARCH_BACKEND='')
+    def test_backend_follows_the_database_vendor(self):
+        self.assertEqual(backend_path('sqlite'), 'search.backends.SQLiteFTSBackend')
+        self.assertEqual(backend_path('postgresql'), 'search.backends.LikeSearchBackend')
+
+    @override_settings(SEARCH_BACKEND='search.backends.LikeSearchBackend')
+    def test_setting_overrides_the_vendor_default(self):
+        self.assertEqual(backend_path('sqlite'), 'search.backends.LikeSearchBackend')
+
+    def test_saves_work_with_the_fallback_backend(self):
+        with mock.patch.object(backends, '_backend', LikeSearchBackend()):
+            manager = User.objects.create_user(username='manager', role='manager')
+            task = Task.objects.create(title='Quarterly report', created_by=manager)
+            task.delete()
+            self.assertEqual(
+                list(backends.get_search_backend().search(User.objects.all(), 'mana')), [manager]
+            )
+
+    def test_sqlite_uses_the_fts_backend_by_default(self):
+        with mock.patch.object(backends, '_backend', None), override_settings(SEARCH_BACKEND=''):
+            self.assertIsInstance(backends.get_search_backend(), SQLiteFTSBackend)
+
+
+class SearchCursorTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', role='manager')
+        for i in range(5):
+            Task.objects.create(title=f'Report {i}', description='report' * i, created_by=self.manager)
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def test_task_pages_round_trip(self):
+        seen = []
+        params = {'q': 'report', 'types': 'tasks', 'limit': 2}
+        while True:
+            response = self.client.get('/api/search/', params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['total']['tasks'], 5)
+            seen += [row['id'] for row in response.data['tasks']]
+            cursor = response.data['next_cursor']['tasks']
+            if not cursor:
+                break
+            params['tasks_cursor'] = cursor
+
+        self.assertEqual(sorted(seen), sorted(Task.objects.values_list('id', flat=True)))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_malformed_cursors_are_rejected(self):
+        for values in (['abc', 1], [True, 1], [-1.5, 'x'], [None, 1], [-1.5]):
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+            response = self.client.get('/api/search/', {'q': 'report', 'types': 'tasks', 'tasks_cursor': cursor})
+            self.assertEqual(response.status_code, 400, values)
+            self.assertEqual(str(response.data['cursor']), 'Invalid cursor')
+
+    def test_a_keyword_without_search_terms_finds_nothing(self):
+        response = self.client.get('/api/search/', {'q': '"*)('})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['tasks'], response.data['employees']), ([], []))
+
+
+class SearchFacetTests(TestCase):
+    def setUp(self):
+        self.platform = TaskGroup.objects.create(name='Platform')
+        self.design = TaskGroup.objects.create(name='Design')
+        for group, status, n in ((self.platform, 'todo', 3), (self.platform, 'completed', 2), (self.design, 'completed', 1)):
+            for i in range(n):
+                Task.objects.create(title=f'Report {group.name} {status} {i}', group=group, status=status)
+        for i, department in enumerate(['Development', 'Development', 'Design']):
+            User.objects.create_user(username=f'reporter{i}', role='employee', department=department)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='admin', role='admin'))
+
+    def search(self, kind, **params):
+        response = self.client.get('/api/search/', {'q': 'report', 'types': kind, **params})
+        self.assertEqual(response.status_code, 200)
+        facets = {
+            name: {row.get('value', row.get('name')): row['count'] for row in rows}
+            for name, rows in response.data['facets'][kind].items()
+        }
+        return response.data['total'][kind], len(response.data[kind]), facets
+
+    def test_a_facet_keeps_its_other_values_when_filtered_on(self):
+        self.assertEqual(self.search('tasks', status='completed'), (3, 3, {
+            'status': {'todo': 3, 'completed': 3},
+            'group': {'Platform': 2, 'Design': 1},
+        }))
+        self.assertEqual(self.search('tasks', status='completed', group=self.platform.id), (2, 2, {
+            'status': {'todo': 3, 'completed': 2},
+            'group': {'Platform': 2, 'Design': 1},
+        }))
+        self.assertEqual(self.search('employees', department='Design'), (1, 1, {
+            'department': {'Development': 2, 'Design': 1},
+        }))
+
+    def test_unfiltered_facets_cover_the_total(self):
+        self.assertEqual(self.search('tasks'), (6, 6, {
+            'status': {'todo': 3, 'completed': 3},
+            'group': {'Platform': 5, 'Design': 1},
+        }))
+
+
+@override_settings(AUTOCOMPLETE_MAX_AGE=300)
+class PrefixIndexTests(TestCase):
+    def test_changes_made_during_a_rebuild_are_kept(self):
+        index = PrefixIndex()
+
+        def documents():
+            yield 'tasks', 1, 'Alpha release'
+            # Signals arriving while the rebuild is still scanning
+            index.add('tasks', 2, 'Alpha beta')
+            index.discard('tasks', 1)
+            yield 'tasks', 3, 'Alpha docs'
+
+        with mock.patch('search.autocomplete.documents', documents):
+            index.build()
+
+        self.assertEqual(index.search('alpha', {'tasks': 10}), {'tasks': [2, 3]})
+
+    def test_lookups_do_not_wait_for_a_rebuild(self):
+        index = PrefixIndex()
+        with mock.patch('search.autocomplete.documents', lambda: iter([('users', 1, 'alice')])):
+            index.build()
+
+        with index.build_lock:
+            self.assertEqual(index.search('al', {'users': 5}), {'users': [1]})
+
+    def test_a_stale_index_is_rebuilt_in_the_background(self):
+        index = PrefixIndex()
+        with mock.patch('search.autocomplete.documents', lambda: iter([])):
+            index.build()
+        index.built_at -= 301
+
+        with mock.patch('search.autocomplete.threading.Thread') as thread:
+            index.ensure_built()
+
+        thread.assert_called_once_with(target=index.refresh, name='autocomplete-refresh', daemon=True)
+        thread.return_value.start.assert_called_once_with()
+
+    def test_signals_update_the_index_of_this_process(self):
+        index = PrefixIndex()
+        with mock.patch('search.autocomplete.documents', lambda: iter([])):
+            index.build()
+
+        with mock.patch('search.signals.autocomplete_index', index):
+            manager = User.objects.create_user(username='manager', role='manager')
+            task = Task.objects.create(title='Quarterly report', created_by=manager)
+            self.assertEqual(index.search('quar', {'tasks': 5}), {'tasks': [task.id]})
+            task.delete()
+            self.assertEqual(index.search('quar', {'tasks': 5}), {'tasks': []})
+
+    def test_limited_users_get_a_full_page_of_visible_tasks(self):
+        manager = User.objects.create_user(username='manager', role='manager')
+        employee = User.objects.create_user(username='employee', role='employee')
+        for i in range(30):
+            Task.objects.create(title=f'Alpha hidden {i}', created_by=manager)
+        mine = [Task.objects.create(title=f'Alpha mine {i}', created_by=manager) for i in range(4)]
+        for task in mine:
+            task.assigned_to.add(employee)
+        index = PrefixIndex()
+        index.build()
+
+        client = APIClient()
+        client.force_authenticate(employee)
+        with mock.patch('search.services.autocomplete_index', index):
+            response = client.get('/api/search/autocomplete/', {'q': 'alpha', 'types': 'tasks', 'limit': 3})
+
+        self.assertEqual(response.status_code, 200)
+        ids = [row['id'] for row in response.data['results']['tasks']]
+        self.assertEqual(len(ids), 3)
+        self.assertLessEqual(set(ids), {task.id for task in mine})
@@ -1,7 +1,8 @@
 # search/urls.py
 from django.urls import path
-from .views import GlobalSearchView
+from .views import AutocompleteView, GlobalSearchView
 
 urlpatterns = [
     path('', GlobalSearchView.as_view(), name='global-search'),
+    path('autocomplete/', AutocompleteView.as_view(), name='search-autocomplete'),
 ]
@@ -1,29 +1,48 @@
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from .services import global_search
+from .services import autocomplete, global_search
 
 class GlobalSearchView(APIView):
+    """
+    Ranked employees and tasks matching `q`. Each type is paged separately
+    with `employees_cursor`/`tasks_cursor` (`limit` per type, default 10,
+    max 50) and narrowed with its facets: `department` for employees,
+    `status` and `group` for tasks.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        keyword = request.query_params.get('q', '').strip()
-        result = global_search(keyword, request.user)
+        keyword, results = global_search(request.query_params, request.user)
+        serialize = {
+            "employees": lambda e: {
+                "id": e.id,
+                "username": e.username,
+                "department": e.department
+            },
+            "tasks": lambda t: {
+                "id": t.id,
+                "title": t.title,
+                "status": t.status,
+                "group": t.group_id
+            },
+        }
 
-        return Response({
-            "keyword": keyword,
-            "employees": [
-                {
-                    "id": e.id,
-                    "username": e.username,
-                    "department": e.department
-                } for e in result["employees"]
-            ],
-            "tasks": [
-                {
-                    "id": t.id,
-                    "title": t.title,
-                    "status": t.status
-                } for t in result["tasks"]
-            ]
-        })
+        data = {"keyword": keyword}
+        for kind, result in results.items():
+            data[kind] = [serialize[kind](row) for row in result['results']]
+        data["next_cursor"] = {kind: result['next_cursor'] for kind, result in results.items()}
+        data["total"] = {kind: result['total'] for kind, result in results.items()}
+        data["facets"] = {kind: result['facets'] for kind, result in results.items()}
+        return Response(data)
+
+class AutocompleteView(APIView):
+    """
+    Typeahead suggestions as ids and labels from the in-memory prefix index.
+    `types` is a comma separated subset of users, tasks, groups (default
+    all); `limit` is per type (default 8, max 20).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(autocomplete(request.query_params, request.user))
@@ -0,0 +1,161 @@
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from .models import Task, TaskGroup
+from .serializers import TaskSerializer
+from .signals import tasks_bulk_changed
+
+User = get_user_model()
+
+MAX_BATCH_SIZE = 500
+TaskAssignment = Task.assigned_to.through
+GroupMembership = TaskGroup.members.through
+
+
+def batch_payloads(data):
+    payloads = data.get('tasks') if isinstance(data, dict) else data
+    if not isinstance(payloads, list) or not payloads:
+        raise ValidationError({"tasks": "Expected a non-empty list of tasks"})
+    if len(payloads) > MAX_BATCH_SIZE:
+        raise ValidationError({"tasks": f"At most {MAX_BATCH_SIZE} tasks per batch"})
+    if not all(isinstance(payload, dict) for payload in payloads):
+        raise ValidationError({"tasks": "Every task must be an object"})
+    return payloads
+
+
+def int_ids(values):
+    return {v for v in values if isinstance(v, int) and not isinstance(v, bool)}
+
+
+def related_objects(payloads):
+    """Load every user and group referenced by the batch with one query each."""
+    user_ids, group_ids = set(), set()
+    for payload in payloads:
+        assigned = payload.get('assigned_to')
+        if isinstance(assigned, list):
+            user_ids |= int_ids(assigned)
+        group_ids |= int_ids([payload.get('group')])
+    return {
+        User: User.objects.in_bulk(user_ids) if user_ids else {},
+        TaskGroup: TaskGroup.objects.in_bulk(group_ids) if group_ids else {},
+    }
+
+
+def validate_batch(serializers):
+    errors = [{} if s.is_valid() else s.errors for s in serializers]
+    if any(errors):
+        raise ValidationError({"tasks": errors})
+    return [s.validated_data for s in serializers]
+
+
+def group_members(groups):
+    members = {}
+    rows = GroupMembership.objects.filter(
+        taskgroup_id__in={g.id for g in groups if g}
+    ).values_list('taskgroup_id', 'user_id')
+    for group_id, user_id in rows:
+        members.setdefault(group_id, set()).add(user_id)
+    return members
+
+
+def final_assignees(data, members):
+    users = {u.id for u in data.get('assigned_to') or []}
+    group = data.get('group')
+    if group:
+        users |= members.get(group.id, set())
+    return users
+
+
+def create_tasks(payloads, user):
+    context = {'related_objects': related_objects(payloads)}
+    validated = validate_batch([TaskSerializer(data=p, context=context) for p in payloads])
+
+    tasks = [
+        Task(
+            title=data['title'],
+            description=data.get('description'),
+            status=data.get('status', 'todo'),
+            due_date=data.get('due_date'),
+            group=data.get('group'),
+            created_by=user
+        ) for data in validated
+    ]
+    now = timezone.now()
+    for task in tasks:
+        task.mark_completion(now)
+    tasks = Task.objects.bulk_create(tasks)
+
+    members = group_members(data.get('group') for data in validated)
+    added = {}
+    for task, data in zip(tasks, validated):
+        # Auto-assign to creator if no one else is assigned
+        added[task.id] = final_assignees(data, members) or {user.id}
+    TaskAssignment.objects.bulk_create([
+        TaskAssignment(task_id=task_id, user_id=user_id)
+        for task_id, user_ids in added.items() for user_id in user_ids
+    ], batch_size=MAX_BATCH_SIZE)
+
+    tasks_bulk_changed.send(sender=Task, created=tasks, updated=[], previous={}, added=added, actor=user)
+    return tasks
+
+
+def update_tasks(payloads, user):
+    ids = [p.get('id') for p in payloads]
+    if len(int_ids(ids)) != len(ids):
+        raise ValidationError({"tasks": "Every task needs a unique integer id"})
+    # Rows stay locked until the batch commits, so nothing can change them
+    # between this read and the bulk_update that bumps their versions
+    instances = Task.objects.select_for_update().in_bulk(ids)
+    missing = [i for i in ids if i not in instances]
+    if missing:
+        raise ValidationError({"tasks": f"Tasks not found: {missing}"})
+
+    context = {
+        'related_objects': related_objects(payloads),
+        'assigned_task_ids': set(TaskAssignment.objects.filter(
+            task_id__in=ids
+        ).values_list('task_id', flat=True).distinct()),
+    }
+    tasks = [instances[i] for i in ids]
+    validated = validate_batch([
+        TaskSerializer(task, data=p, partial=True, context=context) for task, p in zip(tasks, payloads)
+    ])
+
+    previous = {task.id: task.tracked_values() for task in tasks}
+    fields = {'updated_at', 'version', 'completed_at'}
+    now = timezone.now()
+    reassigned = {}
+    for task, data in zip(tasks, validated):
+        for field, value in data.items():
+            if field != 'assigned_to':
+                setattr(task, field, value)
+                fields.add(field)
+        task.updated_at = now
+        task.version += 1
+        task.mark_completion(now)
+        if data.get('assigned_to') is not None or data.get('group') is not None:
+            reassigned[task.id] = data
+
+    Task.objects.bulk_update(tasks, sorted(fields), batch_size=MAX_BATCH_SIZE)
+
+    added = {}
+    if reassigned:
+        members = group_members(data.get('group') for data in reassigned.values())
+        current = {}
+        for task_id, user_id in TaskAssignment.objects.filter(
+            task_id__in=reassigned
+        ).values_list('task_id', 'user_id'):
+            current.setdefault(task_id, set()).add(user_id)
+
+        TaskAssignment.objects.filter(task_id__in=reassigned).delete()
+        rows = []
+        for task_id, data in reassigned.items():
+            users = final_assignees(data, members)
+            rows += [TaskAssignment(task_id=task_id, user_id=user_id) for user_id in users]
+            new_users = users - current.get(task_id, set())
+            if new_users:
+                added[task_id] = new_users
+        TaskAssignment.objects.bulk_create(rows, batch_size=MAX_BATCH_SIZE)
+
+    tasks_bulk_changed.send(sender=Task, created=[], updated=tasks, previous=previous, added=added, actor=user)
+    return tasks
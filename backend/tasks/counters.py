@@ -0,0 +1,53 @@
+from collections import Counter
+from django.conf import settings
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from .models import Task, TaskGroup
+
+
+def group_counter_deltas(changes):
+    """
+    Turn (old, new) pairs of (status, group_id) into per-group
+    (total, completed) deltas; old is None for a new task and new is None
+    for a deleted one.
+    """
+    total, completed = Counter(), Counter()
+    for old, new in changes:
+        for snapshot, sign in ((old, -1), (new, 1)):
+            if snapshot is None or snapshot[1] is None:
+                continue
+            status, group_id = snapshot
+            total[group_id] += sign
+            if status == 'completed':
+                completed[group_id] += sign
+    return {
+        group_id: (total[group_id], completed[group_id])
+        for group_id in set(total) | set(completed)
+        if total[group_id] or completed[group_id]
+    }
+
+
+def apply_group_changes(changes):
+    if not settings.TASK_GROUP_COUNTERS:
+        return
+    for group_id, (total, completed) in group_counter_deltas(changes).items():
+        TaskGroup.objects.filter(id=group_id).update(
+            total_tasks=Greatest(F('total_tasks') + total, Value(0)),
+            completed_tasks=Greatest(F('completed_tasks') + completed, Value(0)),
+        )
+
+
+def recount_groups(group_ids):
+    """Recompute the counters of just these groups from the tasks table."""
+    if settings.TASK_GROUP_COUNTERS:
+        rebuild_group_counters(TaskGroup.objects.filter(id__in=[g for g in group_ids if g is not None]))
+
+
+def rebuild_group_counters(groups=None):
+    tasks = Task.objects.filter(group=OuterRef('pk')).order_by().values('group')
+    total = tasks.annotate(n=Count('id')).values('n')
+    completed = tasks.filter(status='completed').annotate(n=Count('id')).values('n')
+    return (TaskGroup.objects.all() if groups is None else groups).update(
+        total_tasks=Coalesce(Subquery(total), Value(0)),
+        completed_tasks=Coalesce(Subquery(completed), Value(0)),
+    )
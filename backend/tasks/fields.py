@@ -0,0 +1,73 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return self.child_relation.resolve_many(data)
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField whose many=True form resolves the whole id list
+    with one IN query and reports every missing id in a single error,
+    instead of one lookup per id.
+
+    Objects already loaded by the caller can be passed in the serializer
+    context as {'related_objects': {Model: {pk: obj}}}; they are used
+    without querying, which lets a batch of payloads share one lookup.
+    """
+    default_error_messages = {
+        'does_not_exist_many': 'Invalid pk(s) {pk_values} - objects do not exist.',
+    }
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+    def to_pks(self, data):
+        pk_field = self.get_queryset().model._meta.pk
+        pks = []
+        for item in data:
+            if isinstance(item, bool) or item is None:
+                self.fail('incorrect_type', data_type=type(item).__name__)
+            try:
+                pks.append(pk_field.to_python(item))
+            except (TypeError, ValueError, DjangoValidationError):
+                self.fail('incorrect_type', data_type=type(item).__name__)
+        # Drop duplicates, keep the submitted order
+        return list(dict.fromkeys(pks))
+
+    def lookup(self, pks):
+        queryset = self.get_queryset()
+        cached = self.context.get('related_objects', {}).get(queryset.model, {})
+        found = {pk: cached[pk] for pk in pks if pk in cached}
+        remaining = [pk for pk in pks if pk not in found]
+        if remaining:
+            found.update(queryset.in_bulk(remaining))
+        return found
+
+    def to_internal_value(self, data):
+        pk = self.to_pks([data])[0]
+        obj = self.lookup([pk]).get(pk)
+        if obj is None:
+            self.fail('does_not_exist', pk_value=pk)
+        return obj
+
+    def resolve_many(self, data):
+        pks = self.to_pks(data)
+        found = self.lookup(pks)
+
+        missing = [pk for pk in pks if pk not in found]
+        if missing:
+            self.fail('does_not_exist_many', pk_values=missing)
+        return [found[pk] for pk in pks]
@@ -0,0 +1,95 @@
+import datetime
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from backend.pagination import KeysetPaginator
+from .models import Task
+
+# ordering param -> sort field; id is appended as the tie-breaker
+TASK_ORDERINGS = {
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+    'due_date': 'due_sort',
+    'title': 'title',
+    'id': 'id',
+}
+STATUSES = {value for value, _ in Task.STATUS_CHOICES}
+
+
+def parse_param(params, name, parser):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parser(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: "Invalid value"})
+    return parsed
+
+
+def parse_int(value):
+    return int(value) if value.isdigit() else None
+
+
+def parse_timestamp(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        date = parse_date(value)
+        parsed = datetime.datetime.combine(date, datetime.time.min) if date else None
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def filter_tasks(tasks, params):
+    """Apply the task list query params (status, due range, creator, updated_since, group)."""
+    statuses = params.get('status')
+    if statuses:
+        statuses = statuses.split(',')
+        if not STATUSES.issuperset(statuses):
+            raise ValidationError({"status": f"Must be one of {', '.join(sorted(STATUSES))}"})
+        tasks = tasks.filter(status__in=statuses)
+
+    group_id = parse_param(params, 'group_id', parse_int)
+    if group_id:
+        tasks = tasks.filter(group_id=group_id)
+
+    created_by = parse_param(params, 'created_by', parse_int)
+    if created_by:
+        tasks = tasks.filter(created_by_id=created_by)
+
+    due_after = parse_param(params, 'due_after', parse_date)
+    if due_after:
+        tasks = tasks.filter(due_date__gte=due_after)
+
+    due_before = parse_param(params, 'due_before', parse_date)
+    if due_before:
+        tasks = tasks.filter(due_date__lte=due_before)
+
+    updated_since = parse_param(params, 'updated_since', parse_timestamp)
+    if updated_since:
+        tasks = tasks.filter(updated_at__gte=updated_since)
+
+    return tasks
+
+
+def task_paginator(params):
+    """Keyset paginator for the `ordering` param, e.g. `-updated_at` or `due_date`."""
+    ordering = params.get('ordering', '-created_at')
+    descending = ordering.startswith('-')
+    field = TASK_ORDERINGS.get(ordering.lstrip('-'))
+    if field is None:
+        raise ValidationError({"ordering": f"Must be one of {', '.join(TASK_ORDERINGS)}"})
+
+    prefix = '-' if descending else ''
+    keys = (prefix + field,) if field == 'id' else (prefix + field, prefix + 'id')
+    return KeysetPaginator(ordering=keys, default_limit=100, max_limit=500)
+
+
+def sortable_tasks(tasks):
+    # Undated tasks sort as if due on the last possible day
+    return tasks.annotate(due_sort=Coalesce('due_date', Value(datetime.date.max)))
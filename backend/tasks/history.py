@@ -0,0 +1,11 @@
+from django.utils import timezone
+from .models import TaskStatusChange
+
+
+def record_status_changes(changes, now=None):
+    """Append one TaskStatusChange per (task_id, from_status, to_status) that moved."""
+    now = now or timezone.now()
+    TaskStatusChange.objects.bulk_create([
+        TaskStatusChange(task_id=task_id, from_status=old, to_status=new, changed_at=now)
+        for task_id, old, new in changes if old != new
+    ])
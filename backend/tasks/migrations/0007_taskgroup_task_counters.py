@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:53
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_group_counters(apps, schema_editor):
+    TaskGroup = apps.get_model('tasks', 'TaskGroup')
+    groups = TaskGroup.objects.annotate(
+        total=Count('tasks'),
+        completed=Count('tasks', filter=Q(tasks__status='completed'))
+    )
+    for group in groups:
+        TaskGroup.objects.filter(id=group.id).update(total_tasks=group.total, completed_tasks=group.completed)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskgroup',
+            name='completed_tasks',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='taskgroup',
+            name='total_tasks',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_group_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:55
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_taskgroup_task_counters'),
+    ]
+
+    # The auto-created assignment table only has (task_id, user_id) unique;
+    # visibility checks and "my tasks" scans start from the user
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX task_assignee_user_task_idx ON tasks_task_assigned_to (user_id, task_id)',
+            'DROP INDEX task_assignee_user_task_idx',
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:57
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_completed_at(apps, schema_editor):
+    # The real completion time was never stored; the last update is the
+    # closest approximation for tasks that are already completed
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.filter(status='completed').update(completed_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_task_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStatusChange',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('todo', 'To Do'), ('in_progress', 'In Progress'), ('review', 'Review'), ('completed', 'Completed')], max_length=20, null=True)),
+                ('to_status', models.CharField(choices=[('todo', 'To Do'), ('in_progress', 'In Progress'), ('review', 'Review'), ('completed', 'Completed')], max_length=20)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['completed_at'], name='task_completed_at_idx'),
+        ),
+        migrations.AddField(
+            model_name='taskstatuschange',
+            name='task',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='status_changes', to='tasks.task'),
+        ),
+        migrations.AddIndex(
+            model_name='taskstatuschange',
+            index=models.Index(fields=['to_status', 'changed_at'], name='status_change_to_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskstatuschange',
+            index=models.Index(fields=['task', 'changed_at'], name='status_change_task_idx'),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -9,10 +11,31 @@ class TaskGroup(models.Model):
     members = models.ManyToManyField(User, related_name='task_groups', blank=True)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='created_task_groups')
     created_at = models.DateTimeField(auto_now_add=True)
+    # Maintained by tasks.counters when TASK_GROUP_COUNTERS is on
+    total_tasks = models.PositiveIntegerField(default=0)
+    completed_tasks = models.PositiveIntegerField(default=0)
+
+    COUNTER_FIELDS = ('total_tasks', 'completed_tasks')
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # The counters only change through tasks.counters' F() updates; writing
+        # back the values read with this instance would undo any made since
+        if self._state.adding or kwargs.get('force_insert') or kwargs.get('update_fields') is not None:
+            return super().save(*args, **kwargs)
+        kwargs['update_fields'] = [
+            field.name for field in self._meta.concrete_fields
+            if not field.primary_key and field.name not in self.COUNTER_FIELDS
+        ]
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=self.COUNTER_FIELDS)
+
+
+class VersionConflict(Exception):
+    """The task was changed by someone else since the version was read."""
+
 
 class Task(models.Model):
     STATUS_CHOICES = (
@@ -31,6 +54,110 @@ class Task(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='created_tasks')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Bumped on every write, which only applies to the version that was read
+    version = models.PositiveIntegerField(default=1)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status'], name='task_status_idx'),
+            models.Index(fields=['due_date'], name='task_due_date_idx'),
+            models.Index(fields=['created_at'], name='task_created_at_idx'),
+            models.Index(fields=['updated_at'], name='task_updated_at_idx'),
+            models.Index(fields=['completed_at'], name='task_completed_at_idx'),
+        ]
+
+    # Values as loaded from the database, compared against on save
+    TRACKED_FIELDS = ('status', 'group_id', 'created_by_id', 'completed_at')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded_values()
+        return instance
+
+    def remember_loaded_values(self):
+        self._loaded_values = {
+            field: self.__dict__[field] for field in self.TRACKED_FIELDS if field in self.__dict__
+        }
+        self._loaded_version = self.__dict__.get('version')
+
+    def loaded_value(self, field, default=None):
+        return getattr(self, '_loaded_values', {}).get(field, default)
+
+    def loaded_values(self):
+        return dict(getattr(self, '_loaded_values', {}))
+
+    def complete_loaded_values(self):
+        """
+        Read tracked fields that were deferred at load time (e.g. .only())
+        from the row, before a write that may change them.
+        """
+        values = getattr(self, '_loaded_values', None)
+        missing = [field for field in self.TRACKED_FIELDS if field not in (values or {})]
+        if values is not None and missing and self.pk is not None:
+            values.update(Task.objects.filter(pk=self.pk).values(*missing).first() or {})
+
+    def tracked_values(self):
+        return {field: getattr(self, field) for field in self.TRACKED_FIELDS}
+
+    def mark_completion(self, now=None):
+        # completed_at is set when the task first reaches completed and
+        # cleared again if it is reopened
+        if self.status == 'completed':
+            if self.completed_at is None:
+                self.completed_at = now or timezone.now()
+        else:
+            self.completed_at = None
+
+    def claim_version(self, using=None):
+        """
+        Bump the row's version ahead of an update, only while it is still at
+        the version this instance was loaded with (any version for an
+        instance that was not loaded from the database). The UPDATE locks
+        the row, so the values then read back are exactly the ones this save
+        replaces and become loaded_values(). Raises VersionConflict when the
+        row moved on; returns False when there is no row yet.
+        """
+        rows = Task.objects.using(using).filter(pk=self.pk)
+        expected = getattr(self, '_loaded_version', None)
+        if not (rows.filter(version=expected) if expected is not None else rows).update(version=F('version') + 1):
+            if expected is not None and rows.exists():
+                raise VersionConflict()
+            return False
+
+        current = rows.values('version', *self.TRACKED_FIELDS).get()
+        self.version = current.pop('version')
+        self._loaded_values = current
+        return True
+
+    def save(self, *args, **kwargs):
+        self.mark_completion()
+        if self.pk is None or kwargs.get('force_insert'):
+            super().save(*args, **kwargs)
+        else:
+            with transaction.atomic(using=kwargs.get('using')):
+                if self.claim_version(kwargs.get('using')) and kwargs.get('update_fields') is not None:
+                    kwargs['update_fields'] = {*kwargs['update_fields'], 'version', 'completed_at'}
+                super().save(*args, **kwargs)
+        self.remember_loaded_values()
 
     def __str__(self):
         return f"{self.title} ({self.status})"
+
+
+class TaskStatusChange(models.Model):
+    """Append-only log of task status changes; from_status is null on creation."""
+    task = models.ForeignKey(Task, on_delete=models.SET_NULL, null=True, related_name='status_changes')
+    from_status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES, null=True, blank=True)
+    to_status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['to_status', 'changed_at'], name='status_change_to_idx'),
+            models.Index(fields=['task', 'changed_at'], name='status_change_task_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id}: {self.from_status} -> {self.to_status}"
@@ -1,4 +1,6 @@
+from django.conf import settings
 from rest_framework import serializers
+from .fields import BulkPrimaryKeyRelatedField
 from .models import Task, TaskGroup
 from django.contrib.auth import get_user_model
 
@@ -6,7 +8,7 @@ User = get_user_model()
 
 
 class TaskGroupSerializer(serializers.ModelSerializer):
-    members = serializers.PrimaryKeyRelatedField(
+    members = BulkPrimaryKeyRelatedField(
         queryset=User.objects.all(),
         many=True,
         required=False
@@ -20,21 +22,26 @@ class TaskGroupSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_by', 'created_at']
 
     def get_progress(self, obj):
-        tasks = obj.tasks.all()
-        total_tasks = tasks.count()
+        if hasattr(obj, 'task_total'):
+            total_tasks, completed_tasks = obj.task_total, obj.task_completed
+        elif settings.TASK_GROUP_COUNTERS:
+            total_tasks, completed_tasks = obj.total_tasks, obj.completed_tasks
+        else:
+            tasks = obj.tasks.all()
+            total_tasks = tasks.count()
+            completed_tasks = tasks.filter(status='completed').count() if total_tasks else 0
         if total_tasks == 0:
             return 0.0
-        completed_tasks = tasks.filter(status='completed').count()
         return completed_tasks / total_tasks
 
 
 class TaskSerializer(serializers.ModelSerializer):
-    assigned_to = serializers.PrimaryKeyRelatedField(
+    assigned_to = BulkPrimaryKeyRelatedField(
         queryset=User.objects.all(),
         many=True,
         required=False
     )
-    group = serializers.PrimaryKeyRelatedField(
+    group = BulkPrimaryKeyRelatedField(
         queryset=TaskGroup.objects.all(),
         required=False,
         allow_null=True
@@ -46,9 +53,9 @@ class TaskSerializer(serializers.ModelSerializer):
             'id', 'title', 'description',
             'assigned_to', 'group',
             'status', 'due_date',
-            'created_by', 'created_at', 'updated_at'
+            'created_by', 'created_at', 'updated_at', 'completed_at', 'version'
         ]
-        read_only_fields = ['created_by', 'created_at', 'updated_at']
+        read_only_fields = ['created_by', 'created_at', 'updated_at', 'completed_at', 'version']
 
     def validate(self, data):
         assigned_to = data.get('assigned_to')
@@ -56,8 +63,14 @@ class TaskSerializer(serializers.ModelSerializer):
 
         # Check existing values if PATCH (partial update)
         if self.instance and self.partial:
-            assigned_to = assigned_to if assigned_to is not None else self.instance.assigned_to.all()
-            group = group if group is not None else self.instance.group
+            group = group if group is not None else self.instance.group_id
+            if assigned_to is None and not group:
+                # Batch updates preload which tasks have assignees
+                assigned_task_ids = self.context.get('assigned_task_ids')
+                if assigned_task_ids is not None:
+                    assigned_to = self.instance.id in assigned_task_ids
+                else:
+                    assigned_to = self.instance.assigned_to.exists()
 
         if not assigned_to and not group:
             raise serializers.ValidationError(
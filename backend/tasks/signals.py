@@ -0,0 +1,79 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from .counters import apply_group_changes, recount_groups
+from .history import record_status_changes
+from .models import Task
+
+# Sent after the batch endpoint writes tasks with bulk_create/bulk_update,
+# which bypass post_save and m2m_changed. Arguments:
+#   created   - list of new Task instances
+#   updated   - list of updated Task instances
+#   previous  - {task_id: Task.tracked_values()} from before the update
+#   added     - {task_id: set of user ids} newly assigned to each task
+#   actor     - the user who made the change
+tasks_bulk_changed = Signal()
+
+# Sent after tasks.transitions changes a task's status with a queryset
+# update instead of save(). Arguments: task, previous (old status), actor.
+# task.loaded_value() still returns the values from before the change.
+task_status_changed = Signal()
+
+
+def snapshot(task):
+    return (task.status, task.group_id)
+
+
+@receiver(post_save, sender=Task)
+def task_saved_counters(sender, instance, created, **kwargs):
+    # Task.save reads the replaced values from the row it has just locked,
+    # so they are the row's current ones, not a possibly stale load
+    if created:
+        apply_group_changes([(None, snapshot(instance))])
+    elif 'group_id' in instance.loaded_values():
+        old = (instance.loaded_value('status'), instance.loaded_value('group_id'))
+        apply_group_changes([(old, snapshot(instance))])
+    else:
+        recount_groups([instance.group_id])
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted_counters(sender, instance, **kwargs):
+    apply_group_changes([(snapshot(instance), None)])
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def tasks_bulk_counters(sender, created, updated, previous, **kwargs):
+    changes = [(None, snapshot(task)) for task in created]
+    changes += [
+        ((previous[task.id]['status'], previous[task.id]['group_id']), snapshot(task))
+        for task in updated
+    ]
+    apply_group_changes(changes)
+
+
+@receiver(task_status_changed, sender=Task)
+def task_status_counters(sender, task, previous, **kwargs):
+    apply_group_changes([((previous, task.group_id), snapshot(task))])
+
+
+@receiver(post_save, sender=Task)
+def task_saved_history(sender, instance, created, **kwargs):
+    # from_status is only null for a creation; an update whose previous
+    # status is unknown is not logged rather than logged as one
+    if created:
+        record_status_changes([(instance.id, None, instance.status)])
+    elif 'status' in instance.loaded_values():
+        record_status_changes([(instance.id, instance.loaded_value('status'), instance.status)])
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def tasks_bulk_history(sender, created, updated, previous, **kwargs):
+    record_status_changes(
+        [(task.id, None, task.status) for task in created] +
+        [(task.id, previous[task.id]['status'], task.status) for task in updated]
+    )
+
+
+@receiver(task_status_changed, sender=Task)
+def task_status_history(sender, task, previous, **kwargs):
+    record_status_changes([(task.id, previous, task.status)], now=task.updated_at)
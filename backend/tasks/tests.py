@@ -1,3 +1,358 @@
-from django.test import TestCase
+import base64
+import datetime
+import json
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core import serializers
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from jobs.models import Job
+from .counters import rebuild_group_counters
+from .models import Task, TaskGroup, TaskStatusChange, VersionConflict
+from .serializers import TaskSerializer
+from .transitions import TransitionConflict, transition_status
 
-# Create your tests here.
+User = get_user_model()
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+class TaskVersionTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', role='manager')
+        self.employee = User.objects.create_user(username='employee', role='employee')
+        self.task = Task.objects.create(title='Write report', created_by=self.manager)
+        self.task.assigned_to.add(self.employee)
+
+    def test_every_save_bumps_the_version_once(self):
+        self.task.title = 'Write the report'
+        self.task.save()
+        self.task.save(update_fields=['title'])
+
+        self.assertEqual(self.task.version, 3)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).version, 3)
+
+    def test_saving_a_stale_instance_raises_a_conflict(self):
+        stale = Task.objects.get(pk=self.task.pk)
+        transition_status(Task.objects.get(pk=self.task.pk), 'in_progress')
+
+        stale.status = 'review'
+        with self.assertRaises(VersionConflict):
+            stale.save()
+
+        row = Task.objects.get(pk=self.task.pk)
+        self.assertEqual((row.status, row.version), ('in_progress', 2))
+
+    def test_transition_on_a_stale_instance_raises_a_conflict(self):
+        stale = Task.objects.get(pk=self.task.pk)
+        self.task.save()
+
+        with self.assertRaises(TransitionConflict):
+            transition_status(stale, 'completed')
+
+    def test_manager_patch_with_a_stale_if_match_is_rejected(self):
+        transition_status(Task.objects.get(pk=self.task.pk), 'in_progress')
+
+        response = client_for(self.manager).patch(
+            f'/api/tasks/{self.task.pk}/', {'status': 'completed'}, format='json', HTTP_IF_MATCH='"1"'
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).status, 'in_progress')
+
+    def test_manager_patch_with_the_current_version_applies(self):
+        response = client_for(self.manager).patch(
+            f'/api/tasks/{self.task.pk}/', {'status': 'completed'}, format='json', HTTP_IF_MATCH='"1"'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"2"')
+        self.assertEqual(response.data['version'], 2)
+
+    def test_employee_patch_with_a_stale_version_is_rejected(self):
+        self.task.save()
+
+        response = client_for(self.employee).patch(
+            f'/api/tasks/{self.task.pk}/', {'status': 'completed', 'version': 1}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 409)
+
+
+class TaskListCursorTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', role='manager')
+        today = datetime.date(2026, 1, 1)
+        for i in range(5):
+            Task.objects.create(
+                title=f'Task {i}', created_by=self.manager,
+                due_date=today + datetime.timedelta(days=i % 2) if i < 4 else None
+            )
+
+    def test_due_date_pages_round_trip(self):
+        client = client_for(self.manager)
+        seen = []
+        url = '/api/tasks/my-tasks/?ordering=due_date&limit=2'
+        response = client.get(url)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            seen += [row['id'] for row in response.data]
+            cursor = response.get('X-Next-Cursor')
+            if not cursor:
+                break
+            response = client.get(f'{url}&cursor={cursor}')
+
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+        self.assertIsNone(Task.objects.get(pk=seen[-1]).due_date)
+
+    def test_cursor_values_must_match_the_sort_fields(self):
+        client = client_for(self.manager)
+        for values in (['not a date', 1], [True, 1], ['2026-01-01', 'x']):
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+            response = client.get('/api/tasks/my-tasks/', {'ordering': 'due_date', 'cursor': cursor})
+            self.assertEqual(response.status_code, 400, values)
+
+
+class GroupCounterTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', role='manager')
+        self.backend = TaskGroup.objects.create(name='Backend')
+        self.frontend = TaskGroup.objects.create(name='Frontend')
+        self.tasks = [Task.objects.create(title=f'Task {i}', group=self.backend) for i in range(3)]
+
+    def counters(self):
+        return {
+            group.name: (group.total_tasks, group.completed_tasks)
+            for group in TaskGroup.objects.order_by('name')
+        }
+
+    def assertCountersMatchTasks(self):
+        stored = self.counters()
+        rebuild_group_counters()
+        self.assertEqual(stored, self.counters())
+
+    def test_updates_moves_and_deletes(self):
+        task = Task.objects.get(pk=self.tasks[0].pk)
+        task.status = 'completed'
+        task.save()
+        task.group = self.frontend
+        task.save()
+        transition_status(Task.objects.get(pk=self.tasks[1].pk), 'completed')
+        self.tasks[2].delete()
+
+        self.assertEqual(self.counters(), {'Backend': (1, 1), 'Frontend': (1, 1)})
+        self.assertCountersMatchTasks()
+
+    def test_saving_an_instance_not_loaded_from_the_database(self):
+        Task.objects.filter(pk=self.tasks[0].pk).update(status='completed')
+        rebuild_group_counters()
+
+        task = Task(pk=self.tasks[0].pk, status='todo', group=self.frontend)
+        task.save(update_fields=['status', 'group'])
+
+        self.assertEqual(self.counters(), {'Backend': (2, 0), 'Frontend': (1, 0)})
+        self.assertCountersMatchTasks()
+
+    def test_a_stale_move_is_refused_instead_of_double_counted(self):
+        first = Task.objects.get(pk=self.tasks[0].pk)
+        second = Task.objects.get(pk=self.tasks[0].pk)
+        first.group = self.frontend
+        first.save()
+
+        second.group = None
+        with self.assertRaises(VersionConflict):
+            second.save()
+
+        self.assertEqual(self.counters(), {'Backend': (2, 0), 'Frontend': (1, 0)})
+        self.assertCountersMatchTasks()
+
+    def test_saving_a_stale_group_keeps_the_counters(self):
+        group = TaskGroup.objects.get(pk=self.backend.pk)
+        Task.objects.create(title='Task 3', group=self.backend, status='completed')
+
+        group.name = 'Platform'
+        group.save()
+
+        self.assertEqual((group.total_tasks, group.completed_tasks), (4, 1))
+        self.assertEqual(self.counters(), {'Frontend': (0, 0), 'Platform': (4, 1)})
+        self.assertCountersMatchTasks()
+
+    def test_patching_a_group_keeps_the_counters(self):
+        admin = User.objects.create_user(username='admin', role='admin')
+        stale = TaskGroup.objects.get(pk=self.backend.pk)
+        Task.objects.create(title='Task 3', group=self.backend, status='completed')
+
+        with mock.patch('tasks.views.TaskGroupViewSet.get_object', return_value=stale):
+            response = client_for(admin).patch(
+                f'/api/tasks/groups/{self.backend.pk}/', {'description': 'APIs'}, format='json'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['progress'], 0.25)
+        self.assertEqual(self.counters(), {'Backend': (4, 1), 'Frontend': (0, 0)})
+
+
+class StatusLogTests(TestCase):
+    def log(self, task):
+        return list(TaskStatusChange.objects.filter(task=task).order_by('id').values_list('from_status', 'to_status'))
+
+    def test_creation_and_changes_are_logged_once(self):
+        task = Task.objects.create(title='Write report')
+        task.title = 'Write the report'
+        task.save()
+        task.status = 'in_progress'
+        task.save()
+        transition_status(task, 'completed')
+
+        self.assertEqual(self.log(task), [(None, 'todo'), ('todo', 'in_progress'), ('in_progress', 'completed')])
+
+    def test_saving_an_instance_not_loaded_from_the_database_logs_no_creation(self):
+        task = Task.objects.create(title='Write report')
+
+        Task(pk=task.pk, title='Renamed').save(update_fields=['title'])
+        Task(pk=task.pk, status='review').save(update_fields=['status'])
+
+        self.assertEqual(self.log(task), [(None, 'todo'), ('todo', 'review')])
+
+    def test_loading_a_fixture_over_an_existing_row_logs_no_creation(self):
+        task = Task.objects.create(title='Write report')
+        Task.objects.filter(pk=task.pk).update(status='review')
+        fixture = serializers.serialize('json', Task.objects.filter(pk=task.pk))
+
+        for obj in serializers.deserialize('json', fixture):
+            obj.save()
+
+        self.assertEqual(self.log(task), [(None, 'todo')])
+
+
+@override_settings(JOBS_EAGER=False)
+class TaskBatchTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', role='manager')
+        self.employee = User.objects.create_user(username='employee', role='employee')
+        self.backend = TaskGroup.objects.create(name='Backend')
+        self.frontend = TaskGroup.objects.create(name='Frontend')
+        self.client = client_for(self.manager)
+
+    def test_a_batch_with_invalid_items_writes_nothing(self):
+        response = self.client.post('/api/tasks/batch/', {'tasks': [
+            {'title': 'Write report', 'assigned_to': [self.employee.id]},
+            {'title': ''},
+            {'title': 'Review code', 'group': 9999},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.data['tasks']
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(errors[0], {})
+        self.assertIn('title', errors[1])
+        self.assertIn('group', errors[2])
+        self.assertFalse(Task.objects.exists())
+        self.assertFalse(Job.objects.exists())
+
+    def test_an_update_moving_tasks_between_groups(self):
+        tasks = [Task.objects.create(title=f'Task {i}', group=self.backend, created_by=self.manager) for i in range(2)]
+        tasks[0].assigned_to.add(self.employee)
+
+        response = self.client.patch('/api/tasks/batch/', {'tasks': [
+            {'id': tasks[0].id, 'group': self.frontend.id, 'status': 'completed', 'assigned_to': []},
+            {'id': tasks[1].id, 'assigned_to': [self.employee.id]},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        moved, other = Task.objects.get(pk=tasks[0].pk), Task.objects.get(pk=tasks[1].pk)
+        self.assertEqual((moved.group_id, moved.status, moved.version), (self.frontend.id, 'completed', 2))
+        self.assertIsNotNone(moved.completed_at)
+        self.assertEqual(list(moved.assigned_to.all()), [])
+        self.assertEqual(list(other.assigned_to.all()), [self.employee])
+        self.assertEqual(
+            list(TaskStatusChange.objects.filter(task=moved).order_by('id').values_list('from_status', 'to_status')),
+            [(None, 'todo'), ('todo', 'completed')]
+        )
+        self.assertEqual(
+            {g.name: (g.total_tasks, g.completed_tasks) for g in TaskGroup.objects.all()},
+            {'Backend': (1, 0), 'Frontend': (1, 1)}
+        )
+
+    def test_updates_need_unique_integer_ids(self):
+        task = Task.objects.create(title='Task', created_by=self.manager)
+        for ids in ([True], [str(task.id)], [task.id, task.id]):
+            response = self.client.patch('/api/tasks/batch/', {'tasks': [{'id': i} for i in ids]}, format='json')
+            self.assertEqual(response.status_code, 400, ids)
+
+    def test_one_notification_job_per_batch(self):
+        response = self.client.post('/api/tasks/batch/', {'tasks': [
+            {'title': f'Task {i}', 'assigned_to': [self.employee.id]} for i in range(3)
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        job = Job.objects.get()
+        self.assertEqual(job.name, 'notifications.tasks_batch')
+        self.assertEqual(sorted(job.payload['created_ids']), sorted(t['id'] for t in response.data['tasks']))
+
+    @override_settings(JOBS_EAGER=True)
+    def test_an_eager_batch_notifies_once_after_commit(self):
+        with mock.patch('jobs.queue.run_eager') as run_eager:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post('/api/tasks/batch/', {'tasks': [
+                    {'title': f'Task {i}', 'assigned_to': [self.employee.id]} for i in range(3)
+                ]}, format='json')
+                run_eager.assert_not_called()
+
+        run_eager.assert_called_once()
+        self.assertEqual(run_eager.call_args.args[0], 'notifications.tasks_batch')
+
+
+class BulkPrimaryKeyFieldTests(TestCase):
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'e{i}', role='employee') for i in range(3)]
+
+    def test_assignees_are_resolved_with_one_query(self):
+        ids = [u.id for u in reversed(self.users)] + [self.users[0].id]
+        serializer = TaskSerializer(data={'title': 'Write report', 'assigned_to': ids})
+
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+
+        self.assertEqual(serializer.validated_data['assigned_to'], list(reversed(self.users)))
+
+    def test_every_unknown_id_is_reported_in_one_error(self):
+        ids = [self.users[0].id, 9998, self.users[1].id, 9999]
+        serializer = TaskSerializer(data={'title': 'Write report', 'assigned_to': ids})
+
+        with self.assertNumQueries(1):
+            self.assertFalse(serializer.is_valid())
+
+        self.assertEqual(
+            [str(error) for error in serializer.errors['assigned_to']],
+            ['Invalid pk(s) [9998, 9999] - objects do not exist.']
+        )
+
+    def test_ids_of_the_wrong_type_are_rejected(self):
+        for ids in ([True], ['abc'], [None], 'abc'):
+            serializer = TaskSerializer(data={'title': 'Write report', 'assigned_to': ids})
+            self.assertFalse(serializer.is_valid(), ids)
+            self.assertIn('assigned_to', serializer.errors)
+
+    def test_preloaded_objects_need_no_query(self):
+        context = {'related_objects': {User: {u.id: u for u in self.users}}}
+        serializer = TaskSerializer(data={'title': 'Write report', 'assigned_to': [u.id for u in self.users]}, context=context)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_create_endpoint_lists_unknown_assignees(self):
+        manager = User.objects.create_user(username='manager', role='manager')
+
+        response = client_for(manager).post(
+            '/api/tasks/create/', {'title': 'Write report', 'assigned_to': [self.users[0].id, 9999]}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('9999', str(response.data['assigned_to']))
+        self.assertFalse(Task.objects.exists())
@@ -0,0 +1,70 @@
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from .models import Task, VersionConflict
+from .signals import task_status_changed
+
+STATUSES = {value for value, _ in Task.STATUS_CHOICES}
+
+
+class TransitionConflict(VersionConflict):
+    """The task was changed by someone else since the given version was read."""
+
+
+def etag(task):
+    return f'"{task.version}"'
+
+
+def expected_version(request):
+    """
+    Version the client last read, from If-Match (as sent back from the ETag
+    header) or a `version` field in the body; None when neither is given.
+    """
+    header = request.headers.get('If-Match')
+    if header and header.strip() != '*':
+        value = header.strip().removeprefix('W/').strip('"')
+    else:
+        value = request.data.get('version')
+        if value is None:
+            return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({"version": "Invalid version"})
+
+
+def transition_status(task, status, version=None, actor=None):
+    """
+    Move the task to `status` with one conditional UPDATE of status,
+    updated_at, completed_at and version. The update only applies while the row is still
+    at `version` (default: the version the task was loaded with), otherwise
+    TransitionConflict is raised. Returns False, without writing or sending
+    anything, when the status is unchanged.
+    """
+    if status not in STATUSES:
+        raise ValidationError({"status": f"Must be one of {', '.join(sorted(STATUSES))}"})
+
+    if version is None:
+        version = task.version
+    if version != task.version:
+        raise TransitionConflict()
+    if status == task.status:
+        return False
+
+    task.complete_loaded_values()
+    now = timezone.now()
+    previous, previous_completed_at = task.status, task.completed_at
+    task.status = status
+    task.mark_completion(now)
+    updated = Task.objects.filter(pk=task.pk, version=version).update(
+        status=status, updated_at=now, completed_at=task.completed_at, version=F('version') + 1
+    )
+    if not updated:
+        task.status, task.completed_at = previous, previous_completed_at
+        raise TransitionConflict()
+
+    task.updated_at, task.version = now, version + 1
+    # Receivers can still read the pre-transition values with loaded_value()
+    task_status_changed.send(sender=Task, task=task, previous=previous, actor=actor)
+    task.remember_loaded_values()
+    return True
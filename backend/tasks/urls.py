@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
-    TaskCreateView, TaskUpdateDeleteView,
+    TaskCreateView, TaskBatchView, TaskUpdateDeleteView,
     TaskListView, TaskDetailView,
     TaskGroupViewSet
 )
@@ -11,6 +11,7 @@ router.register('groups', TaskGroupViewSet, basename='task-group')
 
 urlpatterns = [
     path('create/', TaskCreateView.as_view()),
+    path('batch/', TaskBatchView.as_view()),
     path('my-tasks/', TaskListView.as_view()),
     path('detail/<int:pk>/', TaskDetailView.as_view()),
     path('<int:pk>/', TaskUpdateDeleteView.as_view()),
@@ -1,17 +1,48 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, viewsets
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Prefetch, Q
 from django.shortcuts import get_object_or_404
 
-from .models import Task, TaskGroup
+from .models import Task, TaskGroup, VersionConflict
+from .batch import batch_payloads, create_tasks, update_tasks
+from .transitions import TransitionConflict, etag, expected_version, transition_status
+from .visibility import can_view, is_assigned, visible_tasks
+from .filters import filter_tasks, sortable_tasks, task_paginator
 from .serializers import TaskSerializer, TaskGroupSerializer
 from users.permissions import IsAdminOrManager
 from rest_framework.permissions import IsAuthenticated
+from backend.pagination import KeysetPagination
+
+User = get_user_model()
+
+
+def version_conflict():
+    return Response(
+        {"error": "Task was changed by someone else, reload it and retry"},
+        status=status.HTTP_409_CONFLICT
+    )
 
 class TaskGroupViewSet(viewsets.ModelViewSet):
     queryset = TaskGroup.objects.all()
     serializer_class = TaskGroupSerializer
     permission_classes = [IsAuthenticated, IsAdminOrManager]
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        groups = TaskGroup.objects.prefetch_related(
+            Prefetch('members', queryset=User.objects.only('id'))
+        )
+        if not settings.TASK_GROUP_COUNTERS:
+            # Progress counts in the same query instead of two COUNTs per group
+            groups = groups.annotate(
+                task_total=Count('tasks'),
+                task_completed=Count('tasks', filter=Q(tasks__status='completed'))
+            )
+        return groups
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -26,48 +57,76 @@ class TaskCreateView(APIView):
         assigned_users = serializer.validated_data.get('assigned_to', [])
         group = serializer.validated_data.get('group')
 
-        task = Task.objects.create(
-            title=serializer.validated_data['title'],
-            description=serializer.validated_data.get('description'),
-            status=serializer.validated_data.get('status', 'todo'),
-            due_date=serializer.validated_data.get('due_date'),
-            group=group,
-            created_by=request.user
-        )
+        # Notifications for the task are written once this commits
+        with transaction.atomic():
+            task = Task.objects.create(
+                title=serializer.validated_data['title'],
+                description=serializer.validated_data.get('description'),
+                status=serializer.validated_data.get('status', 'todo'),
+                due_date=serializer.validated_data.get('due_date'),
+                group=group,
+                created_by=request.user
+            )
+
+            final_users = set(assigned_users)
+            if group:
+                final_users.update(group.members.all())
 
-        final_users = set(assigned_users)
-        if group:
-            final_users.update(group.members.all())
-        
-        # Auto-assign to creator if no one else is assigned
-        if not final_users:
-            final_users.add(request.user)
+            # Auto-assign to creator if no one else is assigned
+            if not final_users:
+                final_users.add(request.user)
 
-        task.assigned_to.set(final_users)
+            task.assigned_to.set(final_users)
 
         return Response(
             {"message": "Task created successfully", "task": TaskSerializer(task).data},
             status=status.HTTP_201_CREATED
         )
 
+class TaskBatchView(APIView):
+    """
+    POST creates and PATCH updates up to 500 tasks in one request, given as
+    {"tasks": [...]} with the same fields as the single-task endpoints (plus
+    "id" for updates). The batch is validated as a whole and written with
+    bulk queries in one transaction.
+    """
+    permission_classes = [IsAuthenticated, IsAdminOrManager]
+
+    def respond(self, tasks, message, status_code):
+        tasks = Task.objects.filter(id__in=[t.id for t in tasks]).prefetch_related('assigned_to').order_by('id')
+        return Response(
+            {"message": message, "tasks": TaskSerializer(tasks, many=True).data},
+            status=status_code
+        )
+
+    @transaction.atomic
+    def post(self, request):
+        tasks = create_tasks(batch_payloads(request.data), request.user)
+        return self.respond(tasks, f"{len(tasks)} tasks created successfully", status.HTTP_201_CREATED)
+
+    @transaction.atomic
+    def patch(self, request):
+        tasks = update_tasks(batch_payloads(request.data), request.user)
+        return self.respond(tasks, f"{len(tasks)} tasks updated successfully", status.HTTP_200_OK)
+
 class TaskListView(APIView):
+    """
+    Filters: status (comma separated), group_id, created_by, due_after,
+    due_before, updated_since. Sorted by `ordering` (default -created_at)
+    and cursor paginated; the next cursor is in the X-Next-Cursor header.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = request.user
-        group_id = request.query_params.get('group_id')
-
-        if user.role in ['admin', 'manager']:
-            tasks = Task.objects.prefetch_related('assigned_to').all()
-        else:
-            tasks = Task.objects.prefetch_related('assigned_to').filter(
-                assigned_to=user
-            )
+        tasks = visible_tasks(request.user).prefetch_related('assigned_to')
 
-        if group_id:
-            tasks = tasks.filter(group_id=group_id)
+        tasks = filter_tasks(tasks, request.query_params)
+        paginator = task_paginator(request.query_params)
+        if 'due_sort' in paginator.fields:
+            tasks = sortable_tasks(tasks)
 
-        return Response(TaskSerializer(tasks, many=True).data)
+        page, next_cursor = paginator.paginate(tasks, request)
+        return paginator.get_response(TaskSerializer(page, many=True).data, next_cursor)
 
 class TaskDetailView(APIView):
     permission_classes = [IsAuthenticated]
@@ -75,13 +134,15 @@ class TaskDetailView(APIView):
     def get(self, request, pk):
         task = get_object_or_404(Task, pk=pk)
 
-        if request.user.role == 'employee' and request.user not in task.assigned_to.all():
+        if not can_view(request, task):
             return Response(
                 {"error": "Task not assigned to you"},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        return Response(TaskSerializer(task).data)
+        response = Response(TaskSerializer(task).data)
+        response['ETag'] = etag(task)
+        return response
 
 class TaskUpdateDeleteView(APIView):
     permission_classes = [IsAuthenticated]
@@ -89,17 +150,31 @@ class TaskUpdateDeleteView(APIView):
     def get_task(self, pk):
         return get_object_or_404(Task, pk=pk)
 
+    @transaction.atomic
     def patch(self, request, pk):
         task = self.get_task(pk)
         user = request.user
 
         if user.role == 'employee':
-            if user not in task.assigned_to.all():
+            if not is_assigned(request, task):
                 return Response({"error": "Not allowed"}, status=403)
 
-            task.status = request.data.get('status', task.status)
-            task.save()
-            return Response(TaskSerializer(task).data)
+            try:
+                transition_status(
+                    task, request.data.get('status', task.status),
+                    version=expected_version(request), actor=user
+                )
+            except TransitionConflict:
+                return version_conflict()
+            response = Response(TaskSerializer(task).data)
+            response['ETag'] = etag(task)
+            return response
+
+        # If-Match (or a body `version`) pins the edit to the version the
+        # client read; save() itself refuses to overwrite a newer row
+        version = expected_version(request)
+        if version is not None and version != task.version:
+            return version_conflict()
 
         serializer = TaskSerializer(task, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
@@ -107,7 +182,10 @@ class TaskUpdateDeleteView(APIView):
         assigned_users = serializer.validated_data.get('assigned_to')
         group = serializer.validated_data.get('group')
 
-        serializer.save()
+        try:
+            serializer.save()
+        except VersionConflict:
+            return version_conflict()
 
         if assigned_users is not None or group is not None:
             final_users = set(assigned_users or [])
@@ -115,7 +193,9 @@ class TaskUpdateDeleteView(APIView):
                 final_users.update(group.members.all())
             task.assigned_to.set(final_users)
 
-        return Response(TaskSerializer(task).data)
+        response = Response(TaskSerializer(task).data)
+        response['ETag'] = etag(task)
+        return response
 
     def delete(self, request, pk):
         task = self.get_task(pk)
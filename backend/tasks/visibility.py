@@ -0,0 +1,49 @@
+from django.db.models import Exists, OuterRef, Q
+from .models import Task
+
+TaskAssignment = Task.assigned_to.through
+
+
+def assignment(user, task=OuterRef('pk')):
+    # Served by the (user_id, task_id) index on the assignment table
+    return TaskAssignment.objects.filter(user_id=user.id, task_id=task)
+
+
+def assigned_tasks(user):
+    return Task.objects.filter(Exists(assignment(user)))
+
+
+def involved_tasks(user):
+    """Tasks the user created or is assigned to, without duplicate rows."""
+    return Task.objects.filter(Q(created_by=user) | Exists(assignment(user)))
+
+
+def visible_tasks(user):
+    """Tasks the user may list and open: everything for admins and managers."""
+    if user.role in ['admin', 'manager']:
+        return Task.objects.all()
+    return assigned_tasks(user)
+
+
+def searchable_tasks(user):
+    if user.role == 'admin':
+        return Task.objects.all()
+    if user.role == 'manager':
+        return involved_tasks(user)
+    return assigned_tasks(user)
+
+
+def is_assigned(request, task):
+    """
+    Whether the request user is assigned to the task (a Task or its id),
+    checked with one EXISTS and remembered for the rest of the request.
+    """
+    task_id = getattr(task, 'pk', task)
+    cache = request.__dict__.setdefault('_assigned_task_cache', {})
+    if task_id not in cache:
+        cache[task_id] = assignment(request.user, task_id).exists()
+    return cache[task_id]
+
+
+def can_view(request, task):
+    return request.user.role in ['admin', 'manager'] or is_assigned(request, task)
@@ -0,0 +1,28 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import send_mail
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from jobs.queue import register
+
+User = get_user_model()
+
+
+@register('users.send_password_reset')
+def send_password_reset(user_id):
+    # The token is made here rather than at enqueue time so it is never
+    # stored in the jobs table
+    user = User.objects.filter(pk=user_id).first()
+    if user is None or not user.email:
+        return
+
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
+    token = default_token_generator.make_token(user)
+    reset_link = f"http://127.0.0.1:3000/reset-password?uid={uid}&token={token}"
+
+    send_mail(
+        "Password Reset",
+        f"Reset your password: {reset_link}",
+        None,
+        [user.email],
+    )
@@ -1,3 +1,28 @@
-from django.test import TestCase
+import re
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core import mail
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from jobs.models import Job
+from jobs.queue import claim, run_job
 
-# Create your tests here.
+User = get_user_model()
+
+
+@override_settings(JOBS_EAGER=False, EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class PasswordResetTests(TestCase):
+    def test_reset_job_stores_only_the_user_id(self):
+        user = User.objects.create_user(username='alice', email='alice@example.com', password='x', role='employee')
+
+        response = APIClient().post('/api/users/password-reset/', {'email': 'alice@example.com'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        job = Job.objects.get(name='users.send_password_reset')
+        self.assertEqual(job.payload, {'user_id': user.pk})
+
+        for claimed in claim('worker-1'):
+            self.assertTrue(run_job(claimed))
+        self.assertEqual(mail.outbox[0].to, ['alice@example.com'])
+        token = re.search(r'token=(\S+)', mail.outbox[0].body).group(1)
+        self.assertTrue(default_token_generator.check_token(user, token))
@@ -1,13 +1,12 @@
 from django.contrib.auth import get_user_model, logout
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.utils.encoding import force_bytes
-from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
+from django.utils.http import urlsafe_base64_decode
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
+from jobs.queue import enqueue
 from .permissions import IsAdminOrManager
 from .serializers import (
     UserSerializer,
@@ -66,17 +65,7 @@ class PasswordResetRequestView(APIView):
         user = User.objects.filter(email=email).first()
 
         if user:
-            uid = urlsafe_base64_encode(force_bytes(user.pk))
-            token = default_token_generator.make_token(user)
-
-            reset_link = f"http://127.0.0.1:3000/reset-password?uid={uid}&token={token}"
-
-            send_mail(
-                "Password Reset",
-                f"Reset your password: {reset_link}",
-                None,
-                [email],
-            )
+            enqueue('users.send_password_reset', user_id=user.pk)
         return Response({"message": "If email exists, reset link sent"})
 
 